@@ -0,0 +1,193 @@
+import json
+import math
+
+QUANTILES = (0.5, 0.9, 0.99)
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(centre - margin, 0.0), min(centre + margin, 1.0)
+
+
+class RunningStats:
+    # Welford's online mean and variance; merge() combines two partial runs.
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+    def standard_error(self):
+        return math.sqrt(self.variance() / self.count) if self.count else 0.0
+
+
+class QuantileSketch:
+    # Log-bucketed histogram: every positive value v lands in bucket
+    # ceil(log_gamma(v)), so any quantile comes back within the relative
+    # accuracy; the bucket count grows with the value range, not the stream.
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.zeros += other.zeros
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class GameStats:
+    # Constant-memory summary of one (difficulty, strategy) stream of games.
+    def __init__(self):
+        self.wins = 0
+        self.moves = RunningStats()
+        self.time = RunningStats()
+        self.memory = RunningStats()
+        self.moves_sketch = QuantileSketch()
+        self.time_sketch = QuantileSketch()
+
+    @property
+    def games(self):
+        return self.moves.count
+
+    def add(self, time_taken, moves, won, memory_used=None):
+        # time_taken is None for games whose time was not measured.
+        self.wins += won
+        self.moves.add(moves)
+        self.moves_sketch.add(moves)
+        if time_taken is not None:
+            self.time.add(time_taken)
+            self.time_sketch.add(time_taken)
+        if memory_used is not None:
+            self.memory.add(memory_used)
+
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    def summary(self):
+        low, high = wilson_interval(self.wins, self.games)
+        summary = {
+            'games': self.games,
+            'wins': self.wins,
+            'win_rate': self.win_rate(),
+            'win_rate_ci95': [low, high],
+            'moves': describe(self.moves, self.moves_sketch),
+            'time': describe(self.time, self.time_sketch),
+        }
+        if self.memory.count:
+            summary['memory_used'] = describe(self.memory)
+        return summary
+
+
+class StoppingRule:
+    # Sequential sampling: a stream has converged once the 95% interval on
+    # its win rate (and, if given, on its mean moves) is no wider than the
+    # target, after at least min_games games.
+    def __init__(self, win_rate_width, moves_width=None, min_games=0):
+        self.win_rate_width = win_rate_width
+        self.moves_width = moves_width
+        self.min_games = min_games
+
+    def reached(self, stats):
+        if stats.games < max(self.min_games, 2):
+            return False
+        low, high = wilson_interval(stats.wins, stats.games)
+        if high - low > self.win_rate_width:
+            return False
+        return self.moves_width is None or 2 * Z_95 * stats.moves.standard_error() <= self.moves_width
+
+    def describe(self):
+        return {'win_rate_width': self.win_rate_width, 'moves_width': self.moves_width, 'min_games': self.min_games}
+
+
+def describe(stats, sketch=None):
+    description = {'mean': stats.mean, 'std': stats.std(),
+                   'min': stats.min if stats.count else None, 'max': stats.max if stats.count else None}
+    if stats.count > 1:
+        half_width = Z_95 * stats.standard_error()
+        description['mean_ci95'] = [stats.mean - half_width, stats.mean + half_width]
+    if sketch is not None:
+        for q in QUANTILES:
+            description[f'p{q * 100:g}'] = sketch.quantile(q)
+    return description
+
+
+def write_summary(path, groups, **info):
+    # groups maps (difficulty, strategy) -> GameStats.
+    entries = [dict(difficulty=difficulty, strategy=strategy, **stats.summary())
+               for (difficulty, strategy), stats in groups.items()]
+    with open(path, 'w') as file:
+        json.dump(dict(info, groups=entries), file, indent=2)
+
+
+def report(groups):
+    lines = []
+    for (difficulty, strategy), stats in groups.items():
+        low, high = wilson_interval(stats.wins, stats.games)
+        moves = stats.moves_sketch
+        lines.append(f"{strategy} / {difficulty}: success rate {stats.win_rate() * 100:.2f}% "
+                     f"(95% CI {low * 100:.2f}-{high * 100:.2f}%) over {stats.games} games; "
+                     f"moves {stats.moves.mean:.2f} +/- {stats.moves.std():.2f} "
+                     f"(p50 {moves.quantile(0.5) or 0:.0f}, p90 {moves.quantile(0.9) or 0:.0f}, "
+                     f"p99 {moves.quantile(0.99) or 0:.0f}); "
+                     f"time {stats.time.mean * 1e6:.1f} us (p99 {(stats.time_sketch.quantile(0.99) or 0) * 1e6:.1f} us)")
+    return "\n".join(lines)
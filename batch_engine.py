@@ -0,0 +1,116 @@
+import time
+from contextlib import nullcontext
+import numpy as np
+from aggregates import GameStats, report, write_summary
+from board import generate_grids
+from minesweeper import LARGE_GRIDS, mine_count
+from results_io import open_results
+from runner import master_seed
+from simulation import summary_file
+
+HEADER = ["id", "difficulty", "time", "score", "result", "memory_used (MB)"]
+
+
+def dilate(mask):
+    height, width = mask.shape[-2:]
+    padded = np.pad(mask, [(0, 0), (1, 1), (1, 1)])
+    grown = np.zeros_like(mask)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            grown |= padded[:, dr:dr + height, dc:dc + width]
+    return grown
+
+
+def cascade(clicked, zeros):
+    # Grows every clicked cell through its connected zero region plus the
+    # numbered border, one 3x3 dilation per step, for all games at once.
+    region = clicked
+    while True:
+        grown = dilate(region & zeros) | clicked
+        if np.array_equal(grown, region):
+            return region
+        region = grown
+
+
+def play_batch(grids, rng):
+    games, height, width = grids.shape
+    cells = height * width
+    mines = (grids == -1).reshape(games, cells)
+    zeros = grids == 0
+    safe_cells = cells - mines.sum(axis=1)
+    revealed = np.zeros((games, height, width), dtype=bool)
+    won = np.zeros(games, dtype=bool)
+    moves = np.zeros(games, dtype=np.int32)
+    active = np.arange(games)
+
+    while active.size:
+        # A uniform random unrevealed cell per game is the argmax of random
+        # keys with the revealed cells masked out.
+        keys = rng.random((active.size, cells))
+        keys[revealed[active].reshape(active.size, cells)] = -1.0
+        picks = keys.argmax(axis=1)
+        moves[active] += 1
+
+        hit = mines[active, picks]
+        alive = active[~hit]
+        picks = picks[~hit]
+        revealed.reshape(games, cells)[alive, picks] = True
+        # Only clicks on a zero cell start a cascade.
+        spread = zeros.reshape(games, cells)[alive, picks]
+        if spread.any():
+            cascading = alive[spread]
+            clicked = np.zeros((cascading.size, cells), dtype=bool)
+            clicked[np.arange(cascading.size), picks[spread]] = True
+            clicked = clicked.reshape(cascading.size, height, width)
+            revealed[cascading] |= cascade(clicked, zeros[cascading])
+
+        done = revealed[alive].sum(axis=(1, 2)) == safe_cells[alive]
+        won[alive[done]] = True
+        active = alive[~done]
+
+    state_bytes = mines.nbytes + zeros.nbytes + revealed.nbytes + won.nbytes + moves.nbytes
+    return moves, won, state_bytes
+
+
+def simulate_games(sizes, path, games=1000000, batch_size=4096, seed=None, summary_path=None):
+    # sizes maps difficulty -> (grid size, mines); path=None skips the
+    # per-game rows, the summary is always written.
+    seed = master_seed(seed)
+    rng = np.random.default_rng(seed)
+    groups = {(difficulty, 'batch'): GameStats() for difficulty in sizes}
+    agent_id = 1
+
+    with open_results(path, HEADER) if path else nullcontext() as writer:
+        for difficulty, (grid_size, num_mines) in sizes.items():
+            stats = groups[difficulty, 'batch']
+            remaining = games
+            while remaining:
+                n = min(batch_size, remaining)
+                start_time = time.perf_counter()
+                grids = generate_grids(n, grid_size, num_mines, rng)
+                moves, won, state_bytes = play_batch(grids, rng)
+                # Wall time and state memory are shared by the whole batch, so
+                # each game is charged an equal share.
+                time_taken = round((time.perf_counter() - start_time) / n, 6)
+                memory_used = round(state_bytes / n / 1024 ** 2, 6)
+                rows = [[agent_id + i, difficulty, time_taken, int(moves[i]), int(won[i]), memory_used]
+                        for i in range(n)]
+                for row in rows:
+                    stats.add(time_taken, row[3], row[4], memory_used)
+                if writer is not None:
+                    writer.writerows(rows)
+                agent_id += n
+                remaining -= n
+
+    print(report(groups))
+    played = max(sum(stats.games for stats in groups.values()), 1)
+    print(f"Success Rate: {sum(stats.wins for stats in groups.values()) / played * 100:.2f}%")
+    write_summary(summary_path or summary_file(path or 'batch_game_results'), groups, seed=seed, games=games,
+                  agent='batch')
+
+
+if __name__ == '__main__':
+    sizes = {difficulty: (grid_size, mine_count(grid_size, difficulty))
+             for difficulty, grid_size in LARGE_GRIDS.items()}
+    simulate_games(sizes, '/content/batch_game_results.csv')
+    print("Simulation complete. The results have been saved in 'batch_game_results.csv'.")
@@ -0,0 +1,156 @@
+import argparse
+import json
+import random
+import statistics
+import time
+from time import perf_counter_ns
+from board import generate_grids
+from minesweeper import LARGE_GRIDS, REVEAL_STRATEGIES, SMALL_GRIDS, Agent, Minesweeper, mine_count
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+GRID_TABLES = {'small': SMALL_GRIDS, 'large': LARGE_GRIDS}
+THRESHOLD = 0.10
+
+
+def fixed_boards(difficulty, grid_sizes, count, seed):
+    # Same seed, difficulty and size always give the same boards, so every
+    # strategy and every later run is measured on identical inputs.
+    grid_size = grid_sizes[difficulty]
+    return generate_grids(count, grid_size, mine_count(grid_size, difficulty),
+                          [seed, DIFFICULTIES.index(difficulty), grid_size])
+
+
+def zero_clicks(boards, seed):
+    rng = random.Random(seed)
+    clicks = []
+    for index, grid in enumerate(boards):
+        zeros = (grid == 0).ravel().nonzero()[0].tolist()
+        if zeros:
+            clicks.append((index, rng.choice(zeros)))
+    return clicks
+
+
+def time_reveals(strategy, difficulty, grid_sizes, boards, clicks):
+    # One cascading click per board on a fresh game; game setup is untimed.
+    total = 0
+    for index, cell in clicks:
+        game = Minesweeper(difficulty, strategy, grid_sizes, boards[index])
+        row, col = divmod(cell, game.grid_size)
+        started = perf_counter_ns()
+        game.make_move(row, col)
+        total += perf_counter_ns() - started
+    return total / max(len(clicks), 1)
+
+
+def time_games(strategy, difficulty, grid_sizes, boards, seed):
+    # One agent reset in place for every board, as simulate_games plays.
+    agent_cls = type('BenchmarkAgent', (Agent,), {'strategy': strategy, 'grid_sizes': grid_sizes})
+    rng = random.Random(seed)
+    agent = agent_cls(difficulty, None, strategy, rng)
+    started = time.perf_counter()
+    for grid in boards:
+        agent.new_game(grid)
+        agent.play_game()
+    return len(boards) / (time.perf_counter() - started)
+
+
+def measure(run, warmup, repeat):
+    for _ in range(warmup):
+        run()
+    return [run() for _ in range(repeat)]
+
+
+def benchmark_config(grids, boards, warmup, repeat, seed):
+    return {'grids': grids, 'boards': boards, 'warmup': warmup, 'repeat': repeat, 'seed': seed}
+
+
+def run_benchmarks(strategies, difficulties, grids='large', boards=200, warmup=1, repeat=5, seed=0):
+    grid_sizes = GRID_TABLES[grids]
+    results = {}
+    for difficulty in difficulties:
+        board_set = fixed_boards(difficulty, grid_sizes, boards, seed)
+        clicks = zero_clicks(board_set, seed)
+        for strategy in strategies:
+            samples = measure(lambda: time_reveals(strategy, difficulty, grid_sizes, board_set, clicks), warmup, repeat)
+            results[f'reveal/{strategy}/{difficulty}'] = {
+                'metric': 'ns_per_reveal', 'better': 'lower',
+                'value': min(samples), 'median': statistics.median(samples), 'samples': samples,
+            }
+            samples = measure(lambda: time_games(strategy, difficulty, grid_sizes, board_set, seed), warmup, repeat)
+            results[f'play/{strategy}/{difficulty}'] = {
+                'metric': 'games_per_second', 'better': 'higher',
+                'value': max(samples), 'median': statistics.median(samples), 'samples': samples,
+            }
+    return {'config': benchmark_config(grids, boards, warmup, repeat, seed), 'results': results}
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    # Returns (name, baseline value, current value, relative change) for every
+    # benchmark that got worse by more than the threshold, and the names of
+    # those present on only one side, which are not compared.
+    regressions = []
+    unmatched = sorted(current['results'].keys() ^ baseline['results'].keys())
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        change = (result['value'] - previous['value']) / previous['value']
+        worse = change > threshold if result['better'] == 'lower' else change < -threshold
+        if worse:
+            regressions.append((name, previous['value'], result['value'], change))
+    return regressions, unmatched
+
+
+def report(benchmarks):
+    lines = []
+    for name, result in benchmarks['results'].items():
+        lines.append(f"{name:<28} {result['value']:14.1f} {result['metric']} (median {result['median']:.1f})")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reveal strategies on fixed seeded boards.")
+    parser.add_argument('--strategies', nargs='+', default=sorted(REVEAL_STRATEGIES), choices=sorted(REVEAL_STRATEGIES))
+    parser.add_argument('--difficulties', nargs='+', default=DIFFICULTIES, choices=DIFFICULTIES)
+    parser.add_argument('--grids', choices=sorted(GRID_TABLES), default='large')
+    parser.add_argument('--boards', type=int, default=200, help="boards per difficulty")
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', help="JSON baseline to check for regressions")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="allowed relative slowdown (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        config = benchmark_config(args.grids, args.boards, args.warmup, args.repeat, args.seed)
+        if baseline['config'] != config:
+            # Different boards, seeds or repeats make the numbers incomparable.
+            raise SystemExit(f"baseline config {baseline['config']} differs from {config}; "
+                             f"rerun with the same options or save a new baseline")
+    benchmarks = run_benchmarks(args.strategies, args.difficulties, args.grids, args.boards, args.warmup,
+                                args.repeat, args.seed)
+    print(report(benchmarks))
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(benchmarks, file, indent=2)
+    if baseline is not None:
+        regressions, unmatched = compare(benchmarks, baseline, args.threshold)
+        for name in unmatched:
+            side = 'baseline' if name in baseline['results'] else 'this run'
+            print(f"NOT COMPARED {name}: only in {side}")
+        compared = len(benchmarks['results'].keys() & baseline['results'].keys())
+        if compared == 0:
+            raise SystemExit("no benchmark in this run matches the baseline")
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:.1f} -> {after:.1f} ({change * 100:+.1f}%)")
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% ({compared} compared).")
+
+
+if __name__ == '__main__':
+    main()
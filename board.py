@@ -0,0 +1,111 @@
+import random
+from functools import lru_cache
+import numpy as np
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+def neighbor_counts(mines):
+    # mines is a bool array of shape (..., H, W); counts are summed over the
+    # 3x3 neighborhood with eight shifted slices of a zero-padded copy.
+    height, width = mines.shape[-2:]
+    pad = [(0, 0)] * (mines.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(mines.astype(np.int8), pad)
+    counts = np.zeros(mines.shape, dtype=np.int8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[..., dr:dr + height, dc:dc + width]
+    return counts
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(grid_size):
+    # Flat cell index -> in-bounds neighbor indices, in DIRECTIONS order.
+    table = []
+    for row in range(grid_size):
+        for col in range(grid_size):
+            table.append(tuple((row + dr) * grid_size + col + dc for dr, dc in DIRECTIONS
+                               if 0 <= row + dr < grid_size and 0 <= col + dc < grid_size))
+    return tuple(table)
+
+
+def generate_grid(grid_size, num_mines, rng=random, out=None, exclude=None):
+    cells = grid_size * grid_size
+    if exclude is None:
+        picks = rng.sample(range(cells), num_mines)
+    else:
+        # Sample from the other cells-1 positions and shift past the excluded one.
+        picks = [pick + (pick >= exclude) for pick in rng.sample(range(cells - 1), num_mines)]
+    mines = np.zeros(cells, dtype=bool)
+    mines[picks] = True
+    mines = mines.reshape(grid_size, grid_size)
+    if out is None:
+        grid = neighbor_counts(mines).astype(int)
+    else:
+        grid = out
+        grid[...] = neighbor_counts(mines)
+    grid[mines] = -1
+    return grid
+
+
+def generate_grids(n, grid_size, num_mines, rng=None):
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    cells = grid_size * grid_size
+    # The num_mines smallest of n independent uniform keys per board give a
+    # uniformly random mine placement for every board in one call.
+    mines = np.zeros((n, cells), dtype=bool)
+    if num_mines:
+        keys = rng.random((n, cells))
+        picks = np.argpartition(keys, num_mines - 1, axis=1)[:, :num_mines]
+        np.put_along_axis(mines, picks, True, axis=1)
+    mines = mines.reshape(n, grid_size, grid_size)
+    grids = neighbor_counts(mines)
+    grids[mines] = -1
+    return grids
+
+
+class GridBatcher:
+    def __init__(self, grid_size, num_mines, batch_size=4096, rng=None):
+        self.grid_size = grid_size
+        self.num_mines = num_mines
+        self.batch_size = batch_size
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self.grids = None
+        self.index = 0
+
+    def next_grid(self):
+        if self.grids is None or self.index == len(self.grids):
+            self.grids = generate_grids(self.batch_size, self.grid_size, self.num_mines, self.rng)
+            self.index = 0
+        grid = self.grids[self.index]
+        self.index += 1
+        return grid
+
+
+def label_zero_region(values, neighbors, start, labels, label):
+    # Flood fill from a zero cell over neighbor_table: marks the connected
+    # zero region and its numbered border with label in labels and returns
+    # those cells, i.e. everything a click on start reveals, with the search
+    # effort (zero cells expanded, stack pushes, peak stack size). A cell
+    # is marked when first seen, so nothing is pushed twice, and labels
+    # never needs clearing as long as every pass uses a fresh label.
+    labels[start] = label
+    members = [start]
+    stack = [start]
+    expansions = 0
+    pushes = peak = 1
+    while stack:
+        expansions += 1
+        for neighbor in neighbors[stack.pop()]:
+            if labels[neighbor] != label:
+                labels[neighbor] = label
+                members.append(neighbor)
+                if values[neighbor] == 0:
+                    stack.append(neighbor)
+                    pushes += 1
+                    if len(stack) > peak:
+                        peak = len(stack)
+    return members, expansions, pushes, peak
@@ -0,0 +1,49 @@
+import random
+
+
+class CellPool:
+    # Unrevealed cells kept in a swap-remove array: cells[:size] are still in
+    # the pool and positions[cell] is where each cell currently sits, so both
+    # discard and a uniform random choice are O(1).
+    def __init__(self, size):
+        self.cells = list(range(size))
+        self.positions = list(range(size))
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, cell):
+        return self.positions[cell] < self.size
+
+    def discard(self, cell):
+        position = self.positions[cell]
+        if position >= self.size:
+            return
+        self.size -= 1
+        last = self.cells[self.size]
+        self.cells[position] = last
+        self.positions[last] = position
+        self.cells[self.size] = cell
+        self.positions[cell] = self.size
+
+    def discard_all(self, cells):
+        # discard() for many cells that are all still in the pool.
+        pool = self.cells
+        positions = self.positions
+        size = self.size
+        for cell in cells:
+            size -= 1
+            position = positions[cell]
+            last = pool[size]
+            pool[position] = last
+            positions[last] = position
+            pool[size] = cell
+            positions[cell] = size
+        self.size = size
+
+    def choice(self, rng=random):
+        return self.cells[rng.randrange(self.size)]
+
+    def reset(self):
+        self.size = len(self.cells)
@@ -0,0 +1,45 @@
+import os
+import pickle
+
+CHECKPOINT_EVERY = 100000
+
+
+class Checkpoint:
+    # Run state is pickled every `every` games at a chunk boundary. It goes to
+    # a temporary file first and os.replace() moves it over the previous one,
+    # so a killed run always leaves a complete checkpoint behind.
+    def __init__(self, path, every=CHECKPOINT_EVERY):
+        self.path = path
+        self.every = every
+        self.pending = 0
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as file:
+            return pickle.load(file)
+
+    def check(self, state, config):
+        changed = sorted(key for key in config.keys() | state['config'].keys()
+                         if config.get(key) != state['config'].get(key))
+        if changed:
+            raise ValueError(f"checkpoint {self.path} belongs to a different run ({', '.join(changed)} changed)")
+
+    def due(self, games):
+        self.pending += games
+        if self.pending < self.every:
+            return False
+        self.pending = 0
+        return True
+
+    def save(self, state):
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,152 @@
+import argparse
+import importlib
+import os
+from checkpoint import CHECKPOINT_EVERY, Checkpoint
+from memory import MEMORY_MODES, SAMPLE_EVERY, MemoryMeter
+
+# Imports are deferred until after argument parsing so that --help and
+# argument errors return without loading NumPy or the engine.
+AGENTS = {
+    'bfs': ('sim1_bfs', 'BFSAgent'),
+    'dfs': ('sim1_dfs', 'DFSAgent'),
+    'ids': ('sim1_iddfs', 'IDSAgent'),
+    'iddfs': ('sim1_iddfs', 'IDDFSAgent'),
+    'a_star': ('sim1_astar', 'AStarAgent'),
+    'a_star_bucket': ('sim1_astar', 'AStarAgent'),
+    'ao_star': ('sim1_aostar', 'AOStarAgent'),
+    'and_or': ('sim1_aostar', 'AndOrAgent'),
+    'solver': ('sim1_solver', 'SolverAgent'),
+    'flood_fill': ('sim1_human_user', 'HumanLikeAgent'),
+    'probability': ('sim1_human_user', 'ProbabilityAgent'),
+}
+
+
+def load_agent(name):
+    module, cls = AGENTS[name]
+    return getattr(importlib.import_module(module), cls)
+
+
+def completed(path, summary):
+    if path is None:
+        return f"Simulation complete. The summary has been saved in '{summary}'."
+    return f"Simulation complete. The results have been saved in '{path}' and the summary in '{summary}'."
+
+
+def run_batch(args, strategies):
+    from batch_engine import simulate_games
+    from minesweeper import mine_count
+    from simulation import summary_file
+
+    unsupported = [option for option, value in [
+        ('several strategies', len(strategies) > 1), ('--corpus', args.corpus),
+        ('--first-click-safe', args.first_click_safe), ('--profile', args.profile or args.profile_output),
+        ('--effort', args.effort), ('--target-win-width', args.target_win_width is not None),
+        ('--checkpoint', args.checkpoint or args.checkpoint_every or args.resume)] if value]
+    if unsupported:
+        raise SystemExit(f"--engine batch does not support {', '.join(unsupported)}")
+    agent = args.agent or (strategies[0] if strategies[0] in AGENTS else 'bfs')
+    agent_cls = load_agent(agent)
+    if not agent_cls.random_clicks:
+        raise SystemExit(f"--engine batch only plays random clicks, not --agent {agent}")
+    sizes = {difficulty: (agent_cls.grid_sizes[difficulty], mine_count(agent_cls.grid_sizes[difficulty], difficulty))
+             for difficulty in args.difficulties}
+    path = None if args.no_rows else args.output or 'batch_game_results.csv'
+    summary = args.summary or summary_file(args.output or 'batch_game_results.csv')
+    simulate_games(sizes, path, args.games, args.batch_size, args.seed, summary)
+    print(completed(path, summary))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run Minesweeper agent simulations.")
+    parser.add_argument('strategy', nargs='+',
+                        help="reveal strategy, e.g. bfs, dfs, flood_fill, ids, iddfs, a_star, a_star_bucket, ao_star, "
+                             "regions; several strategies, or 'all', play the same boards and clicks and write "
+                             "paired rows")
+    parser.add_argument('--agent', choices=sorted(AGENTS),
+                        help="agent configuration (board sizes, memory column); defaults to the strategy's own agent, else bfs")
+    parser.add_argument('--engine', choices=['agent', 'batch'], default='agent',
+                        help="'batch' plays the random-click policy for many games at once with NumPy, on the "
+                             "agent's board sizes; time and memory_used are per-game shares of each batch")
+    parser.add_argument('--batch-size', type=int, default=4096, help="games per batch with --engine batch")
+    parser.add_argument('--difficulties', nargs='+', default=['easy', 'medium', 'hard'],
+                        choices=['easy', 'medium', 'hard'])
+    parser.add_argument('--games', type=int, default=1000000, help="games per difficulty")
+    parser.add_argument('--target-win-width', type=float,
+                        help="stop a difficulty once its 95%% win-rate interval is this narrow, e.g. 0.002; "
+                             "--games becomes the budget")
+    parser.add_argument('--target-moves-width', type=float,
+                        help="also require the 95%% interval on mean moves to be this narrow")
+    parser.add_argument('--min-games', type=int, default=0, help="games to play before the targets are checked")
+    parser.add_argument('--seed', type=int, help="master seed; printed when omitted")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--output', help="results path; a .cols suffix selects the columnar format")
+    parser.add_argument('--summary', help="per-difficulty summary JSON (default: the output path with .summary.json)")
+    parser.add_argument('--no-rows', action='store_true', help="write only the summary, not the per-game rows")
+    parser.add_argument('--checkpoint', help="checkpoint file (default: the output path with .checkpoint)")
+    parser.add_argument('--checkpoint-every', type=int,
+                        help=f"save a checkpoint every N games (default: {CHECKPOINT_EVERY} once checkpointing is on)")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue from the checkpoint if there is one; the output is truncated to match it")
+    parser.add_argument('--corpus', help="replay boards from a corpus built with corpus.py instead of generating them")
+    parser.add_argument('--first-click-safe', action='store_true',
+                        help="place mines after the first move so it is never a mine (not with --corpus)")
+    parser.add_argument('--memory', choices=MEMORY_MODES, default='tracemalloc',
+                        help="how memory_used is measured (default: tracemalloc peak)")
+    parser.add_argument('--memory-sample-every', type=int, default=SAMPLE_EVERY,
+                        help=f"measure memory for every Nth game (default: {SAMPLE_EVERY})")
+    parser.add_argument('--effort', action='store_true',
+                        help="add per-game search-effort columns (expansions, duplicate pushes, peak frontier, ...)")
+    parser.add_argument('--profile', action='store_true', help="report time spent per simulation phase")
+    parser.add_argument('--profile-output', help="also write the phase totals as folded stacks for flame graphs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from aggregates import StoppingRule
+    from minesweeper import REVEAL_STRATEGIES
+    from simulation import simulate_games, simulate_strategies, summary_file
+
+    strategies = list(REVEAL_STRATEGIES) if args.strategy == ['all'] else args.strategy
+    for strategy in strategies:
+        if strategy not in REVEAL_STRATEGIES:
+            raise SystemExit(f"unknown strategy {strategy!r}; choose from {', '.join(sorted(REVEAL_STRATEGIES))}")
+    memory = MemoryMeter(args.memory, args.memory_sample_every)
+    stopping = None
+    if args.target_win_width is not None:
+        stopping = StoppingRule(args.target_win_width, args.target_moves_width, args.min_games)
+    elif args.target_moves_width is not None:
+        raise SystemExit("--target-moves-width needs --target-win-width")
+    if args.engine == 'batch':
+        run_batch(args, strategies)
+        return
+    if len(strategies) > 1:
+        path = args.output or 'paired_game_results.csv'
+    else:
+        path = args.output or f'{strategies[0]}_game_results.csv'
+    summary = args.summary or summary_file(path)
+    checkpoint = None
+    if args.checkpoint or args.checkpoint_every or args.resume:
+        checkpoint = Checkpoint(args.checkpoint or os.path.splitext(path)[0] + '.checkpoint',
+                                args.checkpoint_every or CHECKPOINT_EVERY)
+    if len(strategies) > 1:
+        if args.profile or args.profile_output or args.first_click_safe:
+            raise SystemExit("--profile and --first-click-safe are not supported when comparing strategies")
+        agent_cls = load_agent(args.agent or 'bfs')
+        if not agent_cls.random_clicks:
+            raise SystemExit(f"--agent {args.agent} chooses its own clicks; compare strategies with a random-click agent")
+        simulate_strategies(agent_cls, args.games, None if args.no_rows else path, strategies,
+                            args.workers, args.seed, args.difficulties, memory, args.effort, args.corpus, summary,
+                            stopping, checkpoint, args.resume)
+        print(completed(None if args.no_rows else path, summary))
+        return
+    strategy = strategies[0]
+    agent = args.agent or (strategy if strategy in AGENTS else 'bfs')
+    simulate_games(load_agent(agent), args.games, None if args.no_rows else path, strategy, args.workers, args.seed,
+                   args.difficulties, memory, args.profile or bool(args.profile_output), args.profile_output, args.effort,
+                   args.corpus, args.first_click_safe, summary, stopping, checkpoint, args.resume)
+    print(completed(None if args.no_rows else path, summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import json
+import struct
+import numpy as np
+from board import generate_grids
+from minesweeper import LARGE_GRIDS, SMALL_GRIDS, mine_count
+
+CORPUS_MAGIC = b'MSBOARDS'
+ALIGNMENT = 64
+BATCH_SIZE = 4096
+DIFFICULTIES = ['easy', 'medium', 'hard']
+GRID_TABLES = {'small': SMALL_GRIDS, 'large': LARGE_GRIDS}
+
+
+def aligned(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def build_corpus(path, count, grid_sizes=LARGE_GRIDS, seed=0, difficulties=DIFFICULTIES):
+    # Layout: magic, u64 data start, JSON header, then per difficulty a
+    # packed mine bitmap block (N, ceil(H*W/8)) uint8 and a neighbor count
+    # block (N, H, W) int8 with -1 on mines, each 64-byte aligned.
+    sections = {}
+    offset = 0
+    for difficulty in difficulties:
+        grid_size = grid_sizes[difficulty]
+        cells = grid_size * grid_size
+        section = {
+            'grid_size': grid_size,
+            'num_mines': mine_count(grid_size, difficulty),
+            'count': count,
+            'mines_offset': offset,
+            'mine_bytes': -(-cells // 8),
+        }
+        offset += aligned(count * section['mine_bytes'])
+        section['grids_offset'] = offset
+        offset += aligned(count * cells)
+        sections[difficulty] = section
+    header = json.dumps({'seed': seed, 'difficulties': sections}).encode()
+    start = aligned(len(CORPUS_MAGIC) + 8 + len(header))
+
+    with open(path, 'wb') as file:
+        file.write(CORPUS_MAGIC)
+        file.write(struct.pack('<Q', start))
+        file.write(header)
+        file.truncate(start + offset)
+
+    data = np.memmap(path, dtype=np.uint8, mode='r+')
+    for index, (difficulty, section) in enumerate(sections.items()):
+        grid_size = section['grid_size']
+        mines, grids = corpus_views(data, start, section)
+        rng = np.random.default_rng([seed, index, grid_size])
+        for first in range(0, count, BATCH_SIZE):
+            n = min(BATCH_SIZE, count - first)
+            batch = generate_grids(n, grid_size, section['num_mines'], rng)
+            grids[first:first + n] = batch
+            mines[first:first + n] = np.packbits((batch == -1).reshape(n, -1), axis=1)
+    data.flush()
+    del data
+
+
+def corpus_views(data, start, section):
+    grid_size = section['grid_size']
+    count = section['count']
+    begin = start + section['mines_offset']
+    mines = data[begin:begin + count * section['mine_bytes']].reshape(count, section['mine_bytes'])
+    begin = start + section['grids_offset']
+    grids = data[begin:begin + count * grid_size * grid_size].view(np.int8).reshape(count, grid_size, grid_size)
+    return mines, grids
+
+
+class BoardCorpus:
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self.data[:len(CORPUS_MAGIC)]) != CORPUS_MAGIC:
+            raise ValueError(f"{path} is not a board corpus")
+        start = struct.unpack('<Q', bytes(self.data[len(CORPUS_MAGIC):len(CORPUS_MAGIC) + 8]))[0]
+        header = json.loads(bytes(self.data[len(CORPUS_MAGIC) + 8:start]).rstrip(b'\0'))
+        self.seed = header['seed']
+        self.sections = header['difficulties']
+        # Plain ndarray views of the map: indexing a np.memmap subclass is
+        # several times slower and this sits on the per-game path.
+        data = self.data.view(np.ndarray)
+        self.views = {difficulty: corpus_views(data, start, section)
+                      for difficulty, section in self.sections.items()}
+
+    def count(self, difficulty):
+        return self.sections[difficulty]['count']
+
+    def grid_size(self, difficulty):
+        return self.sections[difficulty]['grid_size']
+
+    def grid(self, difficulty, index):
+        # A read-only view into the mapped file; nothing is copied.
+        return self.views[difficulty][1][index]
+
+    def grids(self, difficulty, first, count):
+        return self.views[difficulty][1][first:first + count]
+
+    def mines(self, difficulty, index):
+        grid_size = self.sections[difficulty]['grid_size']
+        bits = np.unpackbits(self.views[difficulty][0][index], count=grid_size * grid_size)
+        return bits.reshape(grid_size, grid_size).astype(bool)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a memory-mapped corpus of seeded Minesweeper boards.")
+    parser.add_argument('path')
+    parser.add_argument('--boards', type=int, default=1000000, help="boards per difficulty")
+    parser.add_argument('--grids', choices=sorted(GRID_TABLES), default='large')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--difficulties', nargs='+', default=DIFFICULTIES, choices=DIFFICULTIES)
+    args = parser.parse_args(argv)
+    build_corpus(args.path, args.boards, GRID_TABLES[args.grids], args.seed, args.difficulties)
+    print(f"Corpus with {args.boards} boards per difficulty written to '{args.path}'.")
+
+
+if __name__ == '__main__':
+    main()
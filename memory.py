@@ -0,0 +1,42 @@
+import tracemalloc
+
+MEMORY_MODES = ('off', 'rss', 'tracemalloc')
+SAMPLE_EVERY = 100
+
+
+def resident_memory():
+    import psutil
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+class MemoryMeter:
+    # Measures memory_used (MB) for every sample_every-th game by agent_id, so
+    # which games are sampled never depends on the RNG or the worker count.
+    #   tracemalloc: peak bytes allocated while the game is set up and played;
+    #                tracing is switched on only around sampled games.
+    #   rss:         process RSS delta, the old page-granular measurement.
+    #   off:         nothing is measured and the column is left empty.
+    # Sampled games leave their time column empty instead, since measuring
+    # slows them down.
+    def __init__(self, mode='tracemalloc', sample_every=SAMPLE_EVERY):
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"unknown memory mode {mode!r}; choose from {', '.join(MEMORY_MODES)}")
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.baseline = 0.0
+
+    def samples(self, agent_id):
+        return self.mode != 'off' and agent_id % self.sample_every == 0
+
+    def begin(self):
+        if self.mode == 'tracemalloc':
+            tracemalloc.start()
+        else:
+            self.baseline = resident_memory()
+
+    def end(self):
+        if self.mode == 'tracemalloc':
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak / 1024 ** 2
+        return resident_memory() - self.baseline
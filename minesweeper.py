@@ -0,0 +1,588 @@
+import random
+import time
+import heapq
+from time import perf_counter_ns
+from collections import deque
+from board import generate_grid, label_zero_region, neighbor_table
+from cell_pool import CellPool
+
+SMALL_GRIDS = {'easy': 10, 'medium': 15, 'hard': 20}
+LARGE_GRIDS = {'easy': 8, 'medium': 16, 'hard': 24}
+MINE_DENSITY = {'easy': 0.1, 'medium': 0.15, 'hard': 0.2}
+
+REVEAL_STRATEGIES = {}
+
+# Depth added per iddfs iteration; its stack holds at most limit + 1 frames.
+IDDFS_DEPTH_STEP = 2
+
+
+def register_strategy(name):
+    def register(reveal):
+        REVEAL_STRATEGIES[name] = reveal
+        return reveal
+    return register
+
+
+def mine_count(grid_size, difficulty):
+    return int(grid_size * grid_size * MINE_DENSITY[difficulty])
+
+
+class SearchEffort:
+    # Work done by the reveal strategy over one game. A push is any frontier
+    # insertion (the start cell included), a duplicate is a popped entry that
+    # was already revealed or expanded, an expansion is a zero cell whose
+    # neighbors were examined.
+    COLUMNS = ["reveal_calls", "expansions", "pushes", "duplicate_pushes", "peak_frontier", "cells_revealed"]
+
+    def __init__(self):
+        self.calls = 0
+        self.expansions = 0
+        self.pushes = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.revealed = 0
+
+    def record(self, expansions, pushes, duplicates, peak_frontier, revealed):
+        self.calls += 1
+        self.expansions += expansions
+        self.pushes += pushes
+        self.duplicates += duplicates
+        self.revealed += revealed
+        if peak_frontier > self.peak_frontier:
+            self.peak_frontier = peak_frontier
+
+    def row(self):
+        return [self.calls, self.expansions, self.pushes, self.duplicates, self.peak_frontier, self.revealed]
+
+    def merge_row(self, row):
+        calls, expansions, pushes, duplicates, peak_frontier, revealed = row
+        self.calls += calls
+        self.expansions += expansions
+        self.pushes += pushes
+        self.duplicates += duplicates
+        self.revealed += revealed
+        if peak_frontier > self.peak_frontier:
+            self.peak_frontier = peak_frontier
+
+
+@register_strategy('bfs')
+def bfs(game, cell):
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    queue = deque([cell])
+    while queue:
+        cell = queue.popleft()
+        if revealed[cell]:
+            duplicates += 1
+            continue
+        game.reveal_cell(cell)
+        if values[cell] == 0:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                if not revealed[neighbor]:
+                    queue.append(neighbor)
+                    pushes += 1
+            if len(queue) > peak:
+                peak = len(queue)
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+@register_strategy('dfs')
+def dfs(game, cell):
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    stack = [cell]
+    while stack:
+        cell = stack.pop()
+        if revealed[cell]:
+            duplicates += 1
+            continue
+        game.reveal_cell(cell)
+        if values[cell] == 0:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                if not revealed[neighbor]:
+                    stack.append(neighbor)
+                    pushes += 1
+            if len(stack) > peak:
+                peak = len(stack)
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+@register_strategy('flood_fill')
+def flood_fill(game, cell):
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    stack = deque([cell])
+    while stack:
+        cell = stack.pop()
+        if revealed[cell]:
+            duplicates += 1
+            continue
+        game.reveal_cell(cell)
+        if values[cell] == 0:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                if not revealed[neighbor]:
+                    stack.append(neighbor)
+                    pushes += 1
+            if len(stack) > peak:
+                peak = len(stack)
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+@register_strategy('ids')
+def ids(game, cell):
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    max_depth = game.grid_size * game.grid_size
+    stack = [(cell, 0)]
+    while stack:
+        cell, depth = stack.pop()
+        if revealed[cell]:
+            duplicates += 1
+            continue
+        if depth > max_depth:
+            continue
+        game.reveal_cell(cell)
+        if values[cell] == 0 and depth < max_depth:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                stack.append((neighbor, depth + 1))
+            pushes += len(neighbors[cell])
+            if len(stack) > peak:
+                peak = len(stack)
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+@register_strategy('iddfs')
+def iddfs(game, start):
+    # Iterative deepening: every iteration restarts a depth-limited DFS from
+    # the clicked cell with a limit IDDFS_DEPTH_STEP deeper, on a stack of at
+    # most limit + 1 frames of [cell, next neighbor index, cut off below].
+    # depths is the transposition table of the shallowest depth each cell
+    # has been reached at: a cell is entered only along a shallowest path and
+    # once per iteration, and finished records zero cells whose whole subtree
+    # fitted under an earlier limit, which are not expanded again from the
+    # same depth. The search ends with the first iteration that cuts nothing
+    # off.
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    game.reveal_cell(start)
+    depths = {start: 0}
+    entered = {}
+    finished = {}
+    limit = 0
+    cut = True
+    while cut:
+        cut = False
+        limit += IDDFS_DEPTH_STEP
+        expansions += 1
+        stack = [[start, 0, False]]
+        while stack:
+            frame = stack[-1]
+            cell, index, below = frame
+            if index == len(neighbors[cell]):
+                stack.pop()
+                if not below:
+                    finished[cell] = len(stack)
+                elif stack:
+                    stack[-1][2] = True
+                else:
+                    cut = True
+                continue
+            frame[1] = index + 1
+            neighbor = neighbors[cell][index]
+            depth = len(stack)
+            known = depths.get(neighbor)
+            if known is None:
+                if revealed[neighbor]:
+                    continue
+                game.reveal_cell(neighbor)
+            elif depth > known or (depth == known and entered.get(neighbor) == limit):
+                duplicates += 1
+                continue
+            depths[neighbor] = depth
+            entered[neighbor] = limit
+            pushes += 1
+            if values[neighbor] != 0 or finished.get(neighbor) == depth:
+                continue
+            if depth == limit:
+                frame[2] = True
+            else:
+                stack.append([neighbor, 0, False])
+                expansions += 1
+                if len(stack) > peak:
+                    peak = len(stack)
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+def heuristic(game, cell):
+    return game.values[cell]
+
+
+@register_strategy('a_star')
+def a_star(game, start):
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    game.reveal_cell(start)
+    open_list = []
+    closed_list = set()
+    heapq.heappush(open_list, (0, start))
+    while open_list:
+        _, cell = heapq.heappop(open_list)
+        if cell in closed_list:
+            duplicates += 1
+            continue
+        closed_list.add(cell)
+        if values[cell] == 0:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                if neighbor not in closed_list and not revealed[neighbor]:
+                    game.reveal_cell(neighbor)
+                    heapq.heappush(open_list, (heuristic(game, neighbor), neighbor))
+                    pushes += 1
+            if len(open_list) > peak:
+                peak = len(open_list)
+        if game.check_win():
+            game.is_game_over = True
+            game.is_game_won = True
+            break
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+@register_strategy('a_star_bucket')
+def a_star_bucket(game, start):
+    # a_star's fewest-adjacent-mines-first order from nine buckets indexed by
+    # the key instead of a heap. Cells are revealed as they are pushed, so
+    # each is pushed at most once and no closed set is needed.
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = 0
+    pushes = peak = size = 1
+    game.reveal_cell(start)
+    buckets = [[] for _ in range(9)]
+    buckets[0].append(start)
+    lowest = 0
+    while size:
+        while not buckets[lowest]:
+            lowest += 1
+        cell = buckets[lowest].pop()
+        size -= 1
+        if values[cell] == 0:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                if not revealed[neighbor]:
+                    game.reveal_cell(neighbor)
+                    key = values[neighbor]
+                    buckets[key].append(neighbor)
+                    if key < lowest:
+                        lowest = key
+                    pushes += 1
+                    size += 1
+            if size > peak:
+                peak = size
+        if game.check_win():
+            game.is_game_over = True
+            game.is_game_won = True
+            break
+    game.record_effort(expansions, pushes, 0, peak, game.revealed_count - before)
+
+
+@register_strategy('ao_star')
+def ao_star(game, start):
+    revealed = game.revealed
+    values = game.values
+    neighbors = game.neighbors
+    before = game.revealed_count
+    expansions = duplicates = 0
+    pushes = peak = 1
+    game.reveal_cell(start)
+    open_list = deque([start])
+    explored = set()
+    while open_list:
+        cell = open_list.popleft()
+        if cell in explored:
+            duplicates += 1
+            continue
+        explored.add(cell)
+        if values[cell] == 0:
+            expansions += 1
+            for neighbor in neighbors[cell]:
+                if neighbor not in explored and not revealed[neighbor]:
+                    game.reveal_cell(neighbor)
+                    open_list.append(neighbor)
+                    pushes += 1
+            if len(open_list) > peak:
+                peak = len(open_list)
+        if game.check_win():
+            game.is_game_over = True
+            game.is_game_won = True
+            break
+    game.record_effort(expansions, pushes, duplicates, peak, game.revealed_count - before)
+
+
+@register_strategy('regions')
+def reveal_region(game, cell):
+    # A stack flood fill over the neighbor table that labels each cell as
+    # it is first seen instead of checking revealed flags, then reveals the
+    # whole region in bulk.
+    before = game.revealed_count
+    if game.labels is None:
+        game.labels = [0] * (game.grid_size * game.grid_size)
+    game.label += 1
+    members, expansions, pushes, peak = label_zero_region(game.values, game.neighbors, cell, game.labels, game.label)
+    game.reveal_cells(members)
+    game.record_effort(expansions, pushes, 0, peak, game.revealed_count - before)
+
+
+class Minesweeper:
+    # A game object is meant to be reused: reset_game() clears it in place.
+    # Without a supplied grid the board is only generated when the first move
+    # is made, into a buffer kept across games; with first_click_safe the
+    # first clicked cell is never a mine.
+    def __init__(self, difficulty, strategy='bfs', grid_sizes=SMALL_GRIDS, grid=None, rng=random,
+                 first_click_safe=False):
+        self.difficulty = difficulty
+        self.strategy = strategy
+        self.reveal = REVEAL_STRATEGIES[strategy]
+        self.grid_sizes = grid_sizes
+        self.rng = rng
+        self.first_click_safe = first_click_safe
+        self.grid_size = self.get_grid_size()
+        self.num_mines = self.get_num_mines()
+        self.buffer = None
+        self.load_grid(grid)
+        self.neighbors = neighbor_table(self.grid_size)
+        self.blank = bytes(self.grid_size * self.grid_size)
+        self.revealed = bytearray(self.blank)
+        self.revealed_count = 0
+        self.safe_cells = self.grid_size * self.grid_size - self.num_mines
+        self.unrevealed = CellPool(self.grid_size * self.grid_size)
+        # Region labels for the 'regions' reveal; labels only ever increase,
+        # so they stay valid across games without clearing.
+        self.labels = None
+        self.label = 0
+        self.effort = None
+        self.is_game_over = False
+        self.is_game_won = False
+
+    def get_grid_size(self):
+        return self.grid_sizes[self.difficulty]
+
+    def get_num_mines(self):
+        return mine_count(self.grid_size, self.difficulty)
+
+    def generate_grid(self, exclude=None):
+        self.buffer = generate_grid(self.grid_size, self.num_mines, self.rng, self.buffer, exclude)
+        return self.buffer
+
+    def load_grid(self, grid):
+        self.grid = grid
+        self.values = None if grid is None else grid.ravel().tolist()
+
+    def place_mines(self, cell):
+        # Lazy generation for a first move on cell, kept mine-free with
+        # first_click_safe.
+        self.load_grid(self.generate_grid(cell if self.first_click_safe else None))
+
+    def make_move(self, row, col):
+        cell = row * self.grid_size + col
+        if self.values is None:
+            self.place_mines(cell)
+        if self.values[cell] == -1:
+            self.is_game_over = True
+            self.is_game_won = False
+        elif self.values[cell] != 0:
+            self.reveal_cell(cell)
+        else:
+            self.reveal(self, cell)
+
+    def reveal_cell(self, cell):
+        if not self.revealed[cell]:
+            self.revealed[cell] = 1
+            self.revealed_count += 1
+            self.unrevealed.discard(cell)
+
+    def reveal_cells(self, cells):
+        # reveal_cell for a batch: the already revealed cells are filtered
+        # out once, then the flags, the count and the pool are updated
+        # together.
+        revealed = self.revealed
+        cells = [cell for cell in cells if not revealed[cell]]
+        for cell in cells:
+            revealed[cell] = 1
+        self.revealed_count += len(cells)
+        self.unrevealed.discard_all(cells)
+
+    def record_effort(self, expansions, pushes, duplicates, peak_frontier, revealed):
+        if self.effort is not None:
+            self.effort.record(expansions, pushes, duplicates, peak_frontier, revealed)
+
+    def check_win(self):
+        return self.revealed_count == self.safe_cells
+
+    def reset_game(self, grid=None):
+        self.revealed[:] = self.blank
+        self.revealed_count = 0
+        self.unrevealed.reset()
+        self.is_game_over = False
+        self.is_game_won = False
+        self.load_grid(grid)
+
+
+def ordered_choice(order, revealed):
+    # play_order's click rule as a choose() for the timed loop.
+    position = 0
+
+    def choose():
+        nonlocal position
+        while revealed[order[position]]:
+            position += 1
+        position += 1
+        return order[position - 1]
+    return choose
+
+
+def agent_label(agent_cls, strategy):
+    # Agents with their own click policy are labelled by agent as well, so
+    # their results cannot be mistaken for the random-click agent's.
+    return strategy if agent_cls.random_clicks else f'{agent_cls.__name__} ({strategy})'
+
+
+class Agent:
+    # Subclasses are thin configurations: which reveal strategy to use, which
+    # board sizes to play on and whether results carry a memory_used column.
+    # Agents that choose their own clicks override choose() and set
+    # random_clicks = False, since play_order would replace their policy with
+    # the paired click orders.
+    strategy = 'bfs'
+    grid_sizes = SMALL_GRIDS
+    measure_memory = True
+    random_clicks = True
+
+    def __init__(self, difficulty, grid=None, strategy=None, rng=random, first_click_safe=False):
+        self.difficulty = difficulty
+        self.rng = rng
+        self.game = Minesweeper(difficulty, strategy or self.strategy, self.grid_sizes, grid, rng, first_click_safe)
+        self.label = agent_label(type(self), self.game.strategy)
+
+    def new_game(self, grid=None):
+        self.game.reset_game(grid)
+
+    def choose(self):
+        return self.game.unrevealed.choice(self.rng)
+
+    def play_game(self, timer=None):
+        if timer is not None:
+            return self.play_game_timed(timer)
+        moves = 0
+        start_time = time.perf_counter()
+
+        while not self.game.is_game_over:
+            if self.game.unrevealed:
+                row, col = divmod(self.choose(), self.game.grid_size)
+                self.game.make_move(row, col)
+                moves += 1
+            if self.game.check_win():
+                self.game.is_game_over = True
+                self.game.is_game_won = True
+
+        end_time = time.perf_counter()
+        total_time = end_time - start_time
+        return total_time, moves
+
+    def play_order(self, order, timer=None):
+        # Clicks the first still-unrevealed cell of a fixed random permutation
+        # each move: the same distribution as play_game, but replayable, so
+        # different strategies can be run on identical click sequences.
+        game = self.game
+        if timer is not None:
+            return self.play_game_timed(timer, ordered_choice(order, game.revealed))
+        revealed = game.revealed
+        position = 0
+        moves = 0
+        start_time = time.perf_counter()
+
+        while not game.is_game_over:
+            if game.unrevealed:
+                while revealed[order[position]]:
+                    position += 1
+                row, col = divmod(order[position], game.grid_size)
+                position += 1
+                game.make_move(row, col)
+                moves += 1
+            if game.check_win():
+                game.is_game_over = True
+                game.is_game_won = True
+
+        end_time = time.perf_counter()
+        return end_time - start_time, moves
+
+    def play_game_timed(self, timer, choose=None):
+        # Same loop as play_game with each phase bracketed by perf_counter_ns;
+        # kept separate so the untimed loop pays nothing for instrumentation.
+        game = self.game
+        choose = choose or self.choose
+        moves = 0
+        checks = 0
+        sampling = revealing = checking = 0
+        generating = None
+        start_time = time.perf_counter()
+
+        while not game.is_game_over:
+            if game.unrevealed:
+                started = perf_counter_ns()
+                cell = choose()
+                row, col = divmod(cell, game.grid_size)
+                sampled = perf_counter_ns()
+                sampling += sampled - started
+                if game.values is None:
+                    # A board generated on the first move is booked as generate.
+                    game.place_mines(cell)
+                    generating = perf_counter_ns() - sampled
+                    sampled += generating
+                game.make_move(row, col)
+                revealing += perf_counter_ns() - sampled
+                moves += 1
+            started = perf_counter_ns()
+            won = game.check_win()
+            checking += perf_counter_ns() - started
+            checks += 1
+            if won:
+                game.is_game_over = True
+                game.is_game_won = True
+
+        end_time = time.perf_counter()
+        if generating is not None:
+            timer.add(self.label, self.difficulty, 'generate', generating)
+        timer.add(self.label, self.difficulty, 'sample', sampling, moves)
+        timer.add(self.label, self.difficulty, 'reveal', revealing, moves)
+        timer.add(self.label, self.difficulty, 'check_win', checking, checks)
+        return end_time - start_time, moves
@@ -0,0 +1,40 @@
+PHASES = ('generate', 'setup', 'sample', 'reveal', 'check_win')
+
+
+class PhaseTimer:
+    # Accumulates nanoseconds and call counts per (strategy, difficulty, phase).
+    def __init__(self):
+        self.totals = {}
+
+    def add(self, strategy, difficulty, phase, elapsed, calls=1):
+        key = (strategy, difficulty, phase)
+        total = self.totals.get(key)
+        if total is None:
+            self.totals[key] = [elapsed, calls]
+        else:
+            total[0] += elapsed
+            total[1] += calls
+
+    def merge(self, other):
+        for (strategy, difficulty, phase), (elapsed, calls) in other.totals.items():
+            self.add(strategy, difficulty, phase, elapsed, calls)
+
+    def report(self):
+        lines = []
+        for strategy, difficulty in dict.fromkeys(key[:2] for key in self.totals):
+            phases = {phase: self.totals[strategy, difficulty, phase] for phase in PHASES
+                      if (strategy, difficulty, phase) in self.totals}
+            overall = sum(elapsed for elapsed, _ in phases.values()) or 1
+            lines.append(f"{strategy} / {difficulty}:")
+            for phase, (elapsed, calls) in phases.items():
+                lines.append(f"  {phase:<10} {elapsed / 1e9:10.3f} s {elapsed / overall * 100:6.1f}% "
+                             f"{elapsed / calls:10.0f} ns/call {calls:>12} calls")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path):
+        # Brendan Gregg's folded-stack format, one "frame;frame;frame value"
+        # line per phase, readable by flamegraph.pl, speedscope and inferno.
+        with open(path, 'w') as file:
+            for (strategy, difficulty, phase), (elapsed, _) in self.totals.items():
+                file.write(f"simulate;{strategy};{difficulty};{phase} {elapsed}\n")
+
@@ -0,0 +1,242 @@
+import csv
+import json
+import os
+import queue
+import shutil
+import struct
+import threading
+import numpy as np
+
+BATCH_SIZE = 10000
+
+COLUMNAR_SUFFIX = '.cols'
+COLUMNAR_MAGIC = b'MSCOLS01'
+COLUMN_ALIGNMENT = 64
+DIFFICULTIES = ['easy', 'medium', 'hard']
+COLUMN_TYPES = {
+    'id': '<u8',
+    'difficulty': '<u1',
+    'strategy': '<u1',
+    'time': '<f8',
+    'score': '<u4',
+    'result': '<u1',
+    'memory_used': '<f8',
+    'reveal_calls': '<u4',
+    'expansions': '<u4',
+    'pushes': '<u4',
+    'duplicate_pushes': '<u4',
+    'peak_frontier': '<u4',
+    'cells_revealed': '<u4',
+}
+# Text columns stored as small integer codes into a label list.
+LABEL_COLUMNS = ('difficulty', 'strategy')
+
+
+def column_name(header):
+    # "memory_used (MB)" -> "memory_used"
+    return header.split(' ')[0]
+
+
+class ResultWriter:
+    # Rows are buffered into fixed-size batches and handed to a writer thread
+    # through a bounded queue, so formatting and disk writes overlap with the
+    # simulation while memory stays capped at a few batches.
+    def __init__(self, batch_size=BATCH_SIZE, max_batches=4):
+        self.batch_size = batch_size
+        self.batch = []
+        self.queue = queue.Queue(max_batches)
+        self.error = None
+        self.thread = threading.Thread(target=self.drain, daemon=True)
+        self.thread.start()
+
+    def drain(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                break
+            if self.error is None:
+                try:
+                    self.write_batch(batch)
+                except Exception as error:
+                    self.error = error
+            self.queue.task_done()
+
+    def write(self, row):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self.submit()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def submit(self):
+        if self.error is not None:
+            raise self.error
+        self.queue.put(self.batch)
+        self.batch = []
+
+    def flush(self):
+        # Waits until every row written so far is on disk and returns the
+        # position to pass back as `position` to continue this file.
+        if self.batch:
+            self.submit()
+        self.queue.join()
+        if self.error is not None:
+            raise self.error
+        return self.position()
+
+    def stop(self):
+        if self.batch:
+            self.queue.put(self.batch)
+            self.batch = []
+        self.queue.put(None)
+        self.thread.join()
+
+    def close(self):
+        self.stop()
+        if self.error is None:
+            self.finish()
+        else:
+            raise self.error
+
+    def abort(self):
+        # Leaves the output as a checkpoint expects to find it: rows written
+        # so far are flushed but nothing is packed or removed, and the
+        # exception that got us here is not replaced by a write error.
+        self.stop()
+        self.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvResultWriter(ResultWriter):
+    def __init__(self, path, header, batch_size=BATCH_SIZE, max_batches=4, position=None):
+        if position is None:
+            self.file = open(path, mode='w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(header)
+        else:
+            # Drop whatever was written after the checkpoint and append.
+            os.truncate(path, position['offset'])
+            self.file = open(path, mode='a', newline='')
+            self.writer = csv.writer(self.file)
+        super().__init__(batch_size, max_batches)
+
+    def write_batch(self, batch):
+        self.writer.writerows(batch)
+        self.file.flush()
+
+    def position(self):
+        os.fsync(self.file.fileno())
+        return {'offset': self.file.tell()}
+
+    def finish(self):
+        self.file.close()
+
+    def release(self):
+        self.file.close()
+
+
+class ColumnarResultWriter(ResultWriter):
+    # Each column is appended to its own spill file as a typed array while
+    # the run is going; close() packs them behind a small JSON header, every
+    # column starting on a 64-byte boundary so it can be memory-mapped.
+    def __init__(self, path, header, batch_size=BATCH_SIZE, max_batches=4, position=None):
+        self.path = path
+        self.names = [column_name(name) for name in header]
+        self.dtypes = [np.dtype(COLUMN_TYPES.get(name, '<f8')) for name in self.names]
+        if position is None:
+            self.parts = [open(f'{path}.{name}.part', 'wb') for name in self.names]
+            self.rows = 0
+            self.labels = {'difficulty': list(DIFFICULTIES), 'strategy': []}
+        else:
+            for name, dtype in zip(self.names, self.dtypes):
+                os.truncate(f'{path}.{name}.part', position['rows'] * dtype.itemsize)
+            self.parts = [open(f'{path}.{name}.part', 'ab') for name in self.names]
+            self.rows = position['rows']
+            self.labels = {name: list(labels) for name, labels in position['labels'].items()}
+        self.codes = {name: {label: code for code, label in enumerate(labels)} for name, labels in self.labels.items()}
+        super().__init__(batch_size, max_batches)
+
+    def write_batch(self, batch):
+        for index, (name, dtype, part) in enumerate(zip(self.names, self.dtypes, self.parts)):
+            values = [row[index] for row in batch]
+            if name in LABEL_COLUMNS:
+                values = [self.code(name, value) for value in values]
+            elif dtype.kind == 'f':
+                values = [np.nan if value is None else value for value in values]
+            part.write(np.asarray(values, dtype=dtype).tobytes())
+        self.rows += len(batch)
+
+    def code(self, name, label):
+        codes = self.codes[name]
+        if label not in codes:
+            codes[label] = len(codes)
+            self.labels[name].append(label)
+        return codes[label]
+
+    def position(self):
+        for part in self.parts:
+            part.flush()
+            os.fsync(part.fileno())
+        return {'rows': self.rows, 'labels': {name: list(labels) for name, labels in self.labels.items()}}
+
+    def release(self):
+        for part in self.parts:
+            part.close()
+
+    def finish(self):
+        self.release()
+        columns = []
+        offset = 0
+        for name, dtype in zip(self.names, self.dtypes):
+            columns.append({'name': name, 'dtype': dtype.str, 'offset': offset})
+            offset += -(-self.rows * dtype.itemsize // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+        header = {'rows': self.rows, 'columns': columns, 'labels': self.labels}
+        encoded = json.dumps(header).encode()
+        start = -(-(len(COLUMNAR_MAGIC) + 8 + len(encoded)) // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+
+        with open(self.path, 'wb') as file:
+            file.write(COLUMNAR_MAGIC)
+            file.write(struct.pack('<Q', start))
+            file.write(encoded)
+            for name, column in zip(self.names, columns):
+                file.seek(start + column['offset'])
+                with open(f'{self.path}.{name}.part', 'rb') as part:
+                    shutil.copyfileobj(part, file)
+            file.truncate(start + offset)
+        for name in self.names:
+            os.remove(f'{self.path}.{name}.part')
+
+
+def open_results(path, header, batch_size=BATCH_SIZE, position=None):
+    # position, from flush(), reopens a partly written file at that point.
+    if path.endswith(COLUMNAR_SUFFIX):
+        return ColumnarResultWriter(path, header, batch_size, position=position)
+    return CsvResultWriter(path, header, batch_size, position=position)
+
+
+def read_columns(path):
+    # Returns {name: array} views into one read-only memory map, plus
+    # {column: labels} for the coded difficulty and strategy columns.
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(data[:len(COLUMNAR_MAGIC)]) != COLUMNAR_MAGIC:
+        raise ValueError(f"{path} is not a columnar results file")
+    start = struct.unpack('<Q', bytes(data[len(COLUMNAR_MAGIC):len(COLUMNAR_MAGIC) + 8]))[0]
+    header_bytes = bytes(data[len(COLUMNAR_MAGIC) + 8:start]).rstrip(b'\0')
+    header = json.loads(header_bytes)
+    rows = header['rows']
+    columns = {}
+    for column in header['columns']:
+        dtype = np.dtype(column['dtype'])
+        begin = start + column['offset']
+        columns[column['name']] = data[begin:begin + rows * dtype.itemsize].view(dtype)
+    return columns, header['labels']
@@ -0,0 +1,65 @@
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 10000
+
+
+def chunk_seed(seed, difficulty, index):
+    # random.Random hashes str seeds with SHA-512, so every chunk gets an
+    # independent stream that depends only on the master seed and its place
+    # in the plan, never on which worker runs it.
+    return f"{seed}:{difficulty}:{index}"
+
+
+def plan_chunks(difficulties, games, seed, chunk_size=CHUNK_SIZE):
+    # Each chunk is (difficulty, first agent_id, game count, seed, index of
+    # its first game within the difficulty).
+    chunks = []
+    first_id = 1
+    for difficulty in difficulties:
+        for index, start in enumerate(range(0, games, chunk_size)):
+            count = min(chunk_size, games - start)
+            chunks.append((difficulty, first_id, count, chunk_seed(seed, difficulty, index), start))
+            first_id += count
+    return chunks
+
+
+def run_chunks(play_chunk, chunks, workers=None, skip=None):
+    # Yields each chunk's rows in plan order, i.e. in agent_id order.
+    # skip(chunk) is asked again just before a chunk would be yielded, after
+    # the caller has seen every earlier chunk, so what gets skipped does not
+    # depend on the worker count; asking at submit time only saves work.
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            if skip is None or not skip(chunk):
+                yield play_chunk(*chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            if skip is not None and skip(chunk):
+                continue
+            pending.append((chunk, pool.submit(play_chunk, *chunk)))
+            while len(pending) >= 2 * workers:
+                yield from finished(pending, skip)
+        while pending:
+            yield from finished(pending, skip)
+
+
+def finished(pending, skip):
+    chunk, future = pending.popleft()
+    if skip is not None and skip(chunk):
+        future.cancel()
+        return
+    yield future.result()
+
+
+def master_seed(seed=None):
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 63)
+        print(f"Seed: {seed}")
+    return seed
@@ -1,153 +1,190 @@
 import random
-import time
-import csv
-import numpy as np
-import psutil  
-from collections import deque
-
-class Minesweeper:
-    def __init__(self, difficulty):
-        self.difficulty = difficulty
-        self.grid_size = self.get_grid_size()
-        self.num_mines = self.get_num_mines()
-        self.grid = self.generate_grid()
-        self.visited = set()
-        self.is_game_over = False
-        self.is_game_won = False
-
-    def get_grid_size(self):
-        if self.difficulty == 'easy':
-            return 8
-        elif self.difficulty == 'medium':
-            return 16
-        else:
-            return 24
+from bounded_cache import BoundedCache
+from minesweeper import Agent, LARGE_GRIDS
+from simulation import simulate_games
+
+UNKNOWN = 9
+OFF_BOARD = 10
+MINE = 11
+SEARCH_DEPTH = 2
+BRANCHING = 6
+
+
+class AOStarAgent(Agent):
+    strategy = 'ao_star'
+    grid_sizes = LARGE_GRIDS
+
+
+class AndOrAgent(Agent):
+    # Chooses every click with a depth-limited AND-OR search over what has
+    # been revealed so far; unrevealed cells are never looked at. A click is
+    # an OR choice, valued as the chance of surviving the next search_depth
+    # clicks. Its AND branches are the numbers it could reveal, weighted by
+    # local mine estimates: each revealed number y next to a cell gives it
+    # (y - known mines) / (unknown neighbors of y), a satisfied number makes
+    # it safe, and cells without a revealed neighbor get the board-wide
+    # density. Certain mines and safe cells are deduced first.
+    strategy = 'ao_star'
+    grid_sizes = LARGE_GRIDS
+    random_clicks = False
+    search_depth = SEARCH_DEPTH
+    branching = BRANCHING
+
+    def __init__(self, difficulty, grid=None, strategy=None, rng=random, first_click_safe=False):
+        super().__init__(difficulty, grid, strategy, rng, first_click_safe)
+        grid_size = self.game.grid_size
+        self.rows = [cell // grid_size for cell in range(grid_size * grid_size)]
+        self.cols = [cell % grid_size for cell in range(grid_size * grid_size)]
+        # The view is mirrored into a copy bordered with OFF_BOARD cells, so
+        # a cache key window is a few row slices.
+        self.margin = self.search_depth + 1
+        self.stride = grid_size + 2 * self.margin
+        self.padded_index = [(row + self.margin) * self.stride + col + self.margin
+                             for row, col in zip(self.rows, self.cols)]
+        self.view = None
+        self.padded = None
+        # Solved AND nodes keyed by depth, density and the window of revealed
+        # knowledge they read, so the same local situation is solved once
+        # wherever and in whichever game it comes up. Kept across games.
+        self.cache = BoundedCache()
+
+    def choose(self):
+        game = self.game
+        unrevealed = game.unrevealed
+        if game.revealed_count == 0:
+            return unrevealed.choice(self.rng)
+        values = game.values
+        view = self.load_view([values[cell] if known else UNKNOWN for cell, known in enumerate(game.revealed)])
+        safe = self.deduce(unrevealed.cells[unrevealed.size:])
+        if safe:
+            return min(safe)
+        prior = round(game.num_mines / len(unrevealed), 2)
+
+        frontier = set()
+        for cell in unrevealed.cells[unrevealed.size:]:
+            if view[cell]:
+                frontier.update(neighbor for neighbor in game.neighbors[cell] if view[neighbor] == UNKNOWN)
+        if not frontier:
+            return unrevealed.choice(self.rng)
+        # Cheap one-click values pick the OR branches worth searching deeper.
+        candidates = sorted(frontier, key=lambda cell: (-self.and_value(cell, 1, prior), cell))
+        candidates = candidates[:self.branching]
+        for _ in range(4):
+            cell = unrevealed.choice(self.rng)
+            if view[cell] == UNKNOWN and cell not in frontier:
+                candidates.append(cell)
+                break
 
-    def get_num_mines(self):
-        if self.difficulty == 'easy':
-            return int(self.grid_size * self.grid_size * 0.1)  
-        elif self.difficulty == 'medium':
-            return int(self.grid_size * self.grid_size * 0.15)  
-        else:
-            return int(self.grid_size * self.grid_size * 0.2) 
-
-    def generate_grid(self):
-        grid = np.zeros((self.grid_size, self.grid_size), dtype=int)
-        mines = random.sample(range(self.grid_size * self.grid_size), self.num_mines)
-        for mine in mines:
-            row, col = divmod(mine, self.grid_size)
-            grid[row][col] = -1  
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                if grid[row][col] == -1:
+        best_cell = candidates[0]
+        best_value = -1.0
+        for cell in candidates:
+            value = self.and_value(cell, self.search_depth, prior)
+            if value > best_value:
+                best_cell, best_value = cell, value
+        return best_cell
+
+    def load_view(self, view):
+        grid_size = self.game.grid_size
+        padded = self.padded = bytearray([OFF_BOARD]) * (self.stride * self.stride)
+        for row in range(grid_size):
+            start = self.padded_index[row * grid_size]
+            padded[start:start + grid_size] = bytes(view[row * grid_size:(row + 1) * grid_size])
+        self.view = view
+        return view
+
+    def deduce(self, revealed):
+        # Single-point rules to a fixed point: a number whose unknown
+        # neighbors must all be mines marks them MINE in the view, and a
+        # number with all its mines marked makes the rest safe.
+        view = self.view
+        padded = self.padded
+        neighbors = self.game.neighbors
+        numbers = [cell for cell in revealed if view[cell]]
+        safe = set()
+        changed = True
+        while changed:
+            changed = False
+            for cell in numbers:
+                unknown = [neighbor for neighbor in neighbors[cell] if view[neighbor] == UNKNOWN]
+                if not unknown:
                     continue
-                count = 0
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if 0 <= row + dr < self.grid_size and 0 <= col + dc < self.grid_size:
-                            if grid[row + dr][col + dc] == -1:
-                                count += 1
-                grid[row][col] = count
-        return grid
-
-    def make_move(self, row, col):
-        if self.grid[row][col] == -1:
-            self.is_game_over = True
-            self.is_game_won = False
+                mines = view[cell] - sum(1 for neighbor in neighbors[cell] if view[neighbor] == MINE)
+                if mines == 0:
+                    safe.update(unknown)
+                elif mines == len(unknown):
+                    for neighbor in unknown:
+                        view[neighbor] = padded[self.padded_index[neighbor]] = MINE
+                    changed = True
+        return safe
+
+    def and_value(self, center, depth, prior):
+        # Reads only cells within depth + 1 of center, which is the window
+        # the cache key is built from.
+        view = self.view
+        radius = depth + 1
+        key = (depth, prior, self.window(center, radius))
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        mine = self.mine_probability(center, center, radius, prior)
+        if depth == 1 or mine >= 1.0:
+            value = 1.0 - mine
         else:
-            self.visited.add((row, col))
-            if self.grid[row][col] == 0:
-                self.ao_star(row, col)
-
-    def ao_star(self, start_row, start_col):
-        open_list = deque([(start_row, start_col)])
-        explored = set()
-        pending = {} 
-
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-
-        while open_list:
-            r, c = open_list.popleft()
-            if (r, c) in explored:
+            unknown = [cell for cell in self.game.neighbors[center] if view[cell] == UNKNOWN]
+            # A revealed number also counts the neighbors already marked MINE.
+            marked = sum(1 for cell in self.game.neighbors[center] if view[cell] == MINE)
+            outcomes = [1.0]
+            for cell in unknown:
+                p = self.mine_probability(cell, center, radius, prior)
+                outcomes = [a * (1 - p) + b * p for a, b in zip(outcomes + [0.0], [0.0] + outcomes)]
+            total = 0.0
+            for number, weight in enumerate(outcomes):
+                if weight < 1e-9:
+                    continue
+                view[center] = self.padded[self.padded_index[center]] = marked + number
+                # Clicking away from here is worth at least a fresh cell.
+                best = 1.0 - prior
+                for cell in unknown:
+                    best = max(best, self.and_value(cell, depth - 1, prior))
+                total += weight * best
+            view[center] = self.padded[self.padded_index[center]] = UNKNOWN
+            value = (1.0 - mine) * total
+        self.cache.put(key, value)
+        return value
+
+    def mine_probability(self, cell, center, radius, prior):
+        # Only numbers whose whole neighborhood lies inside the window count.
+        view = self.view
+        rows = self.rows
+        cols = self.cols
+        neighbors = self.game.neighbors
+        estimate = -1.0
+        for number_cell in neighbors[cell]:
+            number = view[number_cell]
+            if number >= UNKNOWN:
                 continue
-
-            explored.add((r, c))
-            if self.grid[r][c] == 0:
-                for dr, dc in directions:
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                        if (nr, nc) not in explored and (nr, nc) not in self.visited:
-                            self.visited.add((nr, nc))
-                            open_list.append((nr, nc))
-            if self.check_win():
-                self.is_game_over = True
-                self.is_game_won = True
-                break
-
-    def heuristic(self, row, col):
-        return self.grid[row][col]  
-
-    def check_win(self):
-        return len(self.visited) == (self.grid_size * self.grid_size - self.num_mines)
-
-    def reset_game(self):
-        self.visited.clear()
-        self.is_game_over = False
-        self.is_game_won = False
-        self.grid = self.generate_grid()
-
-class AOStarAgent:
-    def __init__(self, difficulty):
-        self.difficulty = difficulty
-        self.game = Minesweeper(difficulty)
-
-    def play_game(self):
-        moves = 0
-        start_time = time.time()
-        memory_before = psutil.Process().memory_info().rss / 1024 ** 2  # in MB
-
-        while not self.game.is_game_over:
-            unvisited_cells = [(r, c) for r in range(self.game.grid_size)
-                               for c in range(self.game.grid_size) if (r, c) not in self.game.visited]
-            if unvisited_cells:
-                row, col = random.choice(unvisited_cells)
-                self.game.make_move(row, col)
-                moves += 1
-            if self.game.check_win():
-                self.game.is_game_over = True
-                self.game.is_game_won = True
-        end_time = time.time()
-        total_time = end_time - start_time
-        memory_after = psutil.Process().memory_info().rss / 1024 ** 2 
-        memory_used = memory_after - memory_before  
-        return total_time, moves, memory_used
-def simulate_games():
-    results = []
-    agent_id = 1
-    difficulties = ['easy', 'medium', 'hard']
-    wins = 0
-    total_memory_used = 0
-
-    for difficulty in difficulties:
-        for _ in range(1000000):  
-            agent = AOStarAgent(difficulty)
-            time_taken, score, memory_used = agent.play_game()
-            result = 1 if agent.game.is_game_won else 0
-            wins += result
-            total_memory_used += memory_used
-            results.append([agent_id, difficulty, round(time_taken, 2), score, result, round(memory_used, 2)])
-            agent_id += 1
-            agent.game.reset_game()
-
-    success_rate = wins / 100000
-    avg_memory_usage = total_memory_used / 100000
-
-    print(f"Success Rate: {success_rate * 100:.2f}%")
-    print(f"Average Memory Used: {avg_memory_usage:.2f} MB")
+            if max(abs(rows[number_cell] - rows[center]), abs(cols[number_cell] - cols[center])) >= radius:
+                continue
+            unknown = 0
+            for neighbor in neighbors[number_cell]:
+                if view[neighbor] == UNKNOWN:
+                    unknown += 1
+                elif view[neighbor] == MINE:
+                    number -= 1
+            if number <= 0:
+                return 0.0
+            estimate = max(estimate, number / unknown)
+        return prior if estimate < 0 else min(estimate, 1.0)
+
+    def window(self, center, radius):
+        padded = self.padded
+        stride = self.stride
+        width = 2 * radius + 1
+        start = self.padded_index[center] - radius * (stride + 1)
+        return b''.join([padded[row:row + width] for row in range(start, start + width * stride, stride)])
+
+
+if __name__ == '__main__':
+    simulate_games(AOStarAgent, 1000000, '/content/aostar_game_results.csv')
     print("Heuristic Function: The heuristic function prioritizes cells with fewer neighboring mines.")
-    with open('/content/aostar_game_results.csv', mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["id", "difficulty", "time", "score", "result", "memory_used (MB)"])
-        writer.writerows(results)
-simulate_games()
-print("Simulation complete. The results have been saved in 'aostar_game_results.csv'.")
\ No newline at end of file
+    print("Simulation complete. The results have been saved in 'aostar_game_results.csv'.")
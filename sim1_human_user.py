@@ -1,118 +1,182 @@
+import math
 import random
-import time
-import csv
-import numpy as np
-from datetime import datetime
-from collections import deque
-class Minesweeper:
-    def __init__(self, difficulty):
-        self.difficulty = difficulty
-        self.grid_size = self.get_grid_size()
-        self.num_mines = self.get_num_mines()
-        self.grid = self.generate_grid()
-        self.visited = set()
-        self.is_game_over = False
-        self.is_game_won = False
-
-    def get_grid_size(self):
-        if self.difficulty == 'easy':
-            return 10
-        elif self.difficulty == 'medium':
-            return 15
-        else:
-            return 20
-    def get_num_mines(self):
-        if self.difficulty == 'easy':
-            return int(self.grid_size * self.grid_size * 0.1)  
-        elif self.difficulty == 'medium':
-            return int(self.grid_size * self.grid_size * 0.15)  
-        else:
-            return int(self.grid_size * self.grid_size * 0.2)  
-    def generate_grid(self):
-        grid = np.zeros((self.grid_size, self.grid_size), dtype=int)
-        mines = random.sample(range(self.grid_size * self.grid_size), self.num_mines)
-        for mine in mines:
-            row, col = divmod(mine, self.grid_size)
-            grid[row][col] = -1
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                if grid[row][col] == -1:
-                    continue
-                count = 0
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if 0 <= row + dr < self.grid_size and 0 <= col + dc < self.grid_size:
-                            if grid[row + dr][col + dc] == -1:
-                                count += 1
-                grid[row][col] = count
-        return grid
-    def make_move(self, row, col):
-        if self.grid[row][col] == -1:
-            self.is_game_over = True
-            self.is_game_won = False
-        else:
-            self.visited.add((row, col))
-            if self.grid[row][col] == 0:
-                self.flood_fill(row, col)
-
-    def flood_fill(self, row, col):
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        stack = deque([(row, col)])
-        while stack:
-            r, c = stack.pop()
-            if (r, c) in self.visited:
-                continue
-            self.visited.add((r, c))
-            if self.grid[r][c] == 0:
-                for dr, dc in directions:
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size and (nr, nc) not in self.visited:
-                        stack.append((nr, nc))
-    def check_win(self):
-        return len(self.visited) == (self.grid_size * self.grid_size - self.num_mines)
-    def reset_game(self):
-        self.visited.clear()
-        self.is_game_over = False
-        self.is_game_won = False
-        self.grid = self.generate_grid()
-
-class HumanLikeAgent:
-    def __init__(self, difficulty):
-        self.difficulty = difficulty
-        self.game = Minesweeper(difficulty)
-    def play_game(self):
-        moves = 0
-        start_time = time.time()
-        while not self.game.is_game_over:
-            unvisited_cells = [(r, c) for r in range(self.game.grid_size)
-                               for c in range(self.game.grid_size) if (r, c) not in self.game.visited]
-            if unvisited_cells:
-                row, col = random.choice(unvisited_cells)
-                self.game.make_move(row, col)
-                moves += 1
-            if self.game.check_win():
-                self.game.is_game_over = True
-                self.game.is_game_won = True
-        end_time = time.time()
-        total_time = end_time - start_time
-        return total_time, moves
-
-def simulate_games():
-    results = []
-    agent_id = 1
-    difficulties = ['easy', 'medium', 'hard']
-    for difficulty in difficulties:
-        for _ in range(333333):
-            agent = HumanLikeAgent(difficulty)
-            time_taken, score = agent.play_game()
-            result = 1 if agent.game.is_game_won else 0
-            results.append([agent_id, difficulty, round(time_taken, 2), score, result])
-            agent_id += 1
-            agent.game.reset_game()
-    with open('/content/human_game_results.csv', mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["id", "difficulty", "time", "score", "result"])
-        writer.writerows(results)
-
-simulate_games()
-print("Simulation complete. The results have been saved in 'human_game_results.csv'.")
\ No newline at end of file
+from bounded_cache import BoundedCache
+from minesweeper import Agent, SMALL_GRIDS
+from sim1_solver import SolverAgent
+from simulation import simulate_games
+
+ENUMERATION_LIMIT = 24
+COMPONENT_CACHE_SIZE = 16384
+# (row, col) -> (a*row + b*col, c*row + d*col) for the eight symmetries of
+# the square.
+TRANSFORMS = ((1, 0, 0, 1), (0, 1, 1, 0), (1, 0, 0, -1), (-1, 0, 0, 1),
+              (-1, 0, 0, -1), (0, 1, -1, 0), (0, -1, 1, 0), (0, -1, -1, 0))
+
+
+class HumanLikeAgent(Agent):
+    strategy = 'flood_fill'
+    grid_sizes = SMALL_GRIDS
+    measure_memory = False
+
+
+class ProbabilityAgent(SolverAgent):
+    # Plays like SolverAgent while a safe cell is provable; otherwise clicks
+    # the cell least likely to be a mine. Each frontier component's
+    # configurations are enumerated separately, counted per number of mines,
+    # and combined across components with comb(interior cells, mines left)
+    # weights, so the probabilities are exact for the remaining mine count.
+    # Components above enumeration_limit cells fall back to the local
+    # estimate and are left out of the weighting.
+    strategy = 'flood_fill'
+    grid_sizes = SMALL_GRIDS
+    measure_memory = False
+    enumeration_limit = ENUMERATION_LIMIT
+
+    def __init__(self, difficulty, grid=None, strategy=None, rng=random, first_click_safe=False):
+        super().__init__(difficulty, grid, strategy, rng, first_click_safe)
+        # Enumerations keyed by the component's canonical form, kept across
+        # games since the same small frontier shapes keep coming back.
+        self.cache = BoundedCache(COMPONENT_CACHE_SIZE)
+
+    def guess(self):
+        game = self.game
+        solver = self.solver
+        remaining = game.num_mines - len(solver.mines)
+        interior = len(game.unrevealed) - len(solver.mines) - len(solver.watchers)
+
+        solved = []
+        estimates = {}
+        for numbers, cells in solver.components():
+            if len(cells) > self.enumeration_limit:
+                for cell in cells:
+                    estimates[cell] = solver.estimate(cell)
+            else:
+                solved.append(self.solve(numbers, cells))
+
+        weights = [math.comb(interior, remaining - mines) if 0 <= remaining - mines <= interior else 0
+                   for mines in range(remaining + 1)]
+        total = [1]
+        for _, counts, _ in solved:
+            total = convolve(total, counts)
+        norm = sum(count * weight for count, weight in zip(total, weights))
+        if norm == 0:
+            return super().guess()
+
+        for index, (order, counts, cell_counts) in enumerate(solved):
+            others = [1]
+            for other, (_, other_counts, _) in enumerate(solved):
+                if other != index:
+                    others = convolve(others, other_counts)
+            # Weight of the rest of the board given this component holds
+            # `mines` mines.
+            factors = [sum(count * weights[mines + rest] for rest, count in enumerate(others)
+                           if mines + rest <= remaining)
+                       for mines in range(len(counts))]
+            for position, cell in enumerate(order):
+                weight = sum(row[position] * factor for row, factor in zip(cell_counts, factors))
+                estimates[cell] = weight / norm
+
+        best_cell = None
+        best = 2.0
+        for cell, estimate in estimates.items():
+            if estimate < best or (estimate == best and cell < best_cell):
+                best_cell, best = cell, estimate
+        if interior > 0:
+            expected = sum(count * weight * (remaining - mines)
+                           for mines, (count, weight) in enumerate(zip(total, weights)))
+            if best_cell is None or expected / (interior * norm) < best:
+                for _ in range(8):
+                    cell = game.unrevealed.choice(self.rng)
+                    if cell not in solver.watchers and cell not in solver.mines:
+                        return cell
+        return super().guess() if best_cell is None else best_cell
+
+    def solve(self, numbers, cells):
+        # The canonical form is the smallest of the component's eight
+        # symmetric images, shifted to the origin: undecided cell positions
+        # plus (position, mines left) of each number. The numbers' cell sets
+        # follow from adjacency, so nothing else is needed in the key.
+        grid_size = self.game.grid_size
+        constraints = self.solver.constraints
+        key = None
+        order = None
+        for a, b, c, d in TRANSFORMS:
+            placed = []
+            for cell in cells:
+                row, col = divmod(cell, grid_size)
+                placed.append((a * row + b * col, c * row + d * col, cell))
+            marks = []
+            for number_cell in numbers:
+                row, col = divmod(number_cell, grid_size)
+                marks.append((a * row + b * col, c * row + d * col, constraints[number_cell][0]))
+            top = min(row for row, _, _ in placed + marks)
+            left = min(col for _, col, _ in placed + marks)
+            placed.sort()
+            candidate = (tuple((row - top, col - left) for row, col, _ in placed),
+                         tuple(sorted((row - top, col - left, mines) for row, col, mines in marks)))
+            if key is None or candidate < key:
+                key = candidate
+                order = [cell for _, _, cell in placed]
+
+        value = self.cache.get(key)
+        if value is None:
+            position = {cell: index for index, cell in enumerate(order)}
+            value = enumerate_configurations(len(order), [
+                (constraints[number_cell][0], [position[cell] for cell in constraints[number_cell][1]])
+                for number_cell in numbers])
+            self.cache.put(key, value)
+        return order, value[0], value[1]
+
+
+def convolve(left, right):
+    result = [0] * (len(left) + len(right) - 1)
+    for i, a in enumerate(left):
+        if a:
+            for j, b in enumerate(right):
+                result[i + j] += a * b
+    return result
+
+
+def enumerate_configurations(size, constraints):
+    # Backtracks over the cells in order, pruning as soon as a number can no
+    # longer be met. Returns (configurations per mine count, and per mine
+    # count how many of them put a mine on each cell).
+    members = [[] for _ in range(size)]
+    for index, (_, cells) in enumerate(constraints):
+        for cell in cells:
+            members[cell].append(index)
+    need = [mines for mines, _ in constraints]
+    left = [len(cells) for _, cells in constraints]
+    counts = [0] * (size + 1)
+    cell_counts = [[0] * size for _ in range(size + 1)]
+    assignment = [0] * size
+
+    def place(cell, mines):
+        if cell == size:
+            counts[mines] += 1
+            row = cell_counts[mines]
+            for index in range(size):
+                row[index] += assignment[index]
+            return
+        for value in (0, 1):
+            feasible = True
+            for index in members[cell]:
+                left[index] -= 1
+                need[index] -= value
+                if need[index] < 0 or need[index] > left[index]:
+                    feasible = False
+            if feasible:
+                assignment[cell] = value
+                place(cell + 1, mines + value)
+            for index in members[cell]:
+                left[index] += 1
+                need[index] += value
+        assignment[cell] = 0
+
+    place(0, 0)
+    return counts, cell_counts
+
+
+if __name__ == '__main__':
+    simulate_games(HumanLikeAgent, 333333, '/content/human_game_results.csv')
+    print("Simulation complete. The results have been saved in 'human_game_results.csv'.")
@@ -0,0 +1,214 @@
+import heapq
+import random
+from minesweeper import Agent, LARGE_GRIDS
+from simulation import simulate_games
+
+
+class FrontierSolver:
+    # Every revealed number with undecided neighbors is a constraint
+    # [mines still to place, set of undecided neighbors]; watchers maps an
+    # undecided cell back to the numbers constraining it. update() reads only
+    # the cells revealed since the previous call, which the game's CellPool
+    # keeps at cells[size:previous size], and propagation only visits
+    # constraints whose sets changed, so the work per move follows the
+    # changed area rather than the board. The same goes for guessing: each
+    # constraint visited pushes fresh local estimates of its cells onto a heap,
+    # and stale entries are dropped when they reach the top.
+    def __init__(self, game):
+        self.game = game
+        self.reset()
+
+    def reset(self):
+        self.seen = len(self.game.unrevealed)
+        self.constraints = {}
+        self.watchers = {}
+        self.mines = set()
+        self.safe = []
+        self.safe_cells = set()
+        self.estimates = []
+
+    def update(self):
+        game = self.game
+        pool = game.unrevealed
+        values = game.values
+        revealed = game.revealed
+        neighbors = game.neighbors
+        constraints = self.constraints
+        watchers = self.watchers
+        dirty = []
+        for cell in pool.cells[pool.size:self.seen]:
+            for number_cell in watchers.pop(cell, ()):
+                constraints[number_cell][1].discard(cell)
+                dirty.append(number_cell)
+            if values[cell] > 0:
+                mines = values[cell]
+                undecided = set()
+                for neighbor in neighbors[cell]:
+                    if neighbor in self.mines:
+                        mines -= 1
+                    elif not revealed[neighbor] and neighbor not in self.safe_cells:
+                        undecided.add(neighbor)
+                if undecided:
+                    constraints[cell] = [mines, undecided]
+                    for neighbor in undecided:
+                        watchers.setdefault(neighbor, set()).add(cell)
+                    dirty.append(cell)
+        self.seen = pool.size
+        self.propagate(dirty)
+
+    def propagate(self, dirty):
+        constraints = self.constraints
+        touched = set()
+        while dirty:
+            number_cell = dirty.pop()
+            touched.add(number_cell)
+            constraint = constraints.get(number_cell)
+            if constraint is None:
+                continue
+            mines, undecided = constraint
+            if not undecided:
+                del constraints[number_cell]
+            elif mines == 0:
+                self.decide(list(undecided), False, dirty)
+            elif mines == len(undecided):
+                self.decide(list(undecided), True, dirty)
+            else:
+                self.compare(number_cell, dirty)
+        for number_cell in touched:
+            if number_cell in constraints:
+                for cell in constraints[number_cell][1]:
+                    heapq.heappush(self.estimates, (self.estimate(cell), cell))
+
+    def estimate(self, cell):
+        constraints = self.constraints
+        return max(constraints[number_cell][0] / len(constraints[number_cell][1])
+                   for number_cell in self.watchers[cell])
+
+    def best_guess(self):
+        # The undecided frontier cell with the lowest local estimate, ties to
+        # the lowest cell, or None when the frontier is empty.
+        estimates = self.estimates
+        while estimates:
+            estimate, cell = estimates[0]
+            if cell in self.watchers and self.estimate(cell) == estimate:
+                return estimate, cell
+            heapq.heappop(estimates)
+        return None
+
+    def compare(self, number_cell, dirty):
+        # Subset rule: if one constraint's cells all lie in another's, the
+        # cells left over must hold the difference of their mine counts.
+        mines, undecided = self.constraints[number_cell]
+        others = set()
+        for cell in undecided:
+            others.update(self.watchers[cell])
+        others.discard(number_cell)
+        for other in others:
+            other_mines, other_undecided = self.constraints[other]
+            if undecided <= other_undecided:
+                rest, count = other_undecided - undecided, other_mines - mines
+            elif other_undecided <= undecided:
+                rest, count = undecided - other_undecided, mines - other_mines
+            else:
+                continue
+            if rest and (count == 0 or count == len(rest)):
+                self.decide(list(rest), count > 0, dirty)
+                dirty.append(number_cell)
+                return
+
+    def decide(self, cells, mine, dirty):
+        constraints = self.constraints
+        for cell in cells:
+            if mine:
+                self.mines.add(cell)
+            elif cell not in self.safe_cells:
+                self.safe_cells.add(cell)
+                self.safe.append(cell)
+            for number_cell in self.watchers.pop(cell, ()):
+                constraint = constraints[number_cell]
+                constraint[1].discard(cell)
+                if mine:
+                    constraint[0] -= 1
+                dirty.append(number_cell)
+
+    def components(self):
+        # Constraints linked through shared undecided cells, as lists of
+        # (number cells, undecided cells); separate components can be solved
+        # independently of each other.
+        constraints = self.constraints
+        watchers = self.watchers
+        seen = set()
+        components = []
+        for start in constraints:
+            if start in seen:
+                continue
+            seen.add(start)
+            stack = [start]
+            numbers = []
+            cells = set()
+            while stack:
+                number_cell = stack.pop()
+                numbers.append(number_cell)
+                for cell in constraints[number_cell][1]:
+                    if cell not in cells:
+                        cells.add(cell)
+                        for other in watchers[cell]:
+                            if other not in seen:
+                                seen.add(other)
+                                stack.append(other)
+            components.append((numbers, cells))
+        return components
+
+    def next_safe(self):
+        revealed = self.game.revealed
+        while self.safe:
+            cell = self.safe.pop()
+            self.safe_cells.discard(cell)
+            if not revealed[cell]:
+                return cell
+        return None
+
+
+class SolverAgent(Agent):
+    # Clicks cells the frontier solver has proven safe; when it is stuck it
+    # guesses the frontier cell with the lowest local mine estimate, or an
+    # interior cell if the remaining mine density is lower. Only revealed
+    # numbers are read.
+    strategy = 'bfs'
+    grid_sizes = LARGE_GRIDS
+    random_clicks = False
+
+    def __init__(self, difficulty, grid=None, strategy=None, rng=random, first_click_safe=False):
+        super().__init__(difficulty, grid, strategy, rng, first_click_safe)
+        self.solver = FrontierSolver(self.game)
+
+    def new_game(self, grid=None):
+        super().new_game(grid)
+        self.solver.reset()
+
+    def choose(self):
+        if self.game.revealed_count == 0:
+            return self.game.unrevealed.choice(self.rng)
+        self.solver.update()
+        cell = self.solver.next_safe()
+        return self.guess() if cell is None else cell
+
+    def guess(self):
+        game = self.game
+        solver = self.solver
+        best = solver.best_guess()
+        undecided = len(game.unrevealed) - len(solver.mines)
+        density = (game.num_mines - len(solver.mines)) / max(undecided, 1)
+        if best is None or density < best[0]:
+            for _ in range(8):
+                cell = game.unrevealed.choice(self.rng)
+                if cell not in solver.watchers and cell not in solver.mines:
+                    return cell
+        if best is None:
+            return next(cell for cell in game.unrevealed.cells[:game.unrevealed.size] if cell not in solver.mines)
+        return best[1]
+
+
+if __name__ == '__main__':
+    simulate_games(SolverAgent, 1000000, '/content/solver_game_results.csv')
+    print("Simulation complete. The results have been saved in 'solver_game_results.csv'.")
@@ -0,0 +1,345 @@
+import os
+import random
+from contextlib import nullcontext
+from functools import partial
+from itertools import repeat
+from time import perf_counter_ns
+import numpy as np
+from aggregates import Z_95, GameStats, RunningStats, report, wilson_interval, write_summary
+from board import GridBatcher
+from corpus import BoardCorpus
+from memory import MemoryMeter
+from minesweeper import REVEAL_STRATEGIES, SearchEffort, agent_label, mine_count
+from profiling import PhaseTimer
+from runner import master_seed, plan_chunks, run_chunks
+from results_io import open_results
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+
+def result_header(agent_cls, effort=False, paired=False):
+    header = ["id", "difficulty", "strategy", "time", "score", "result"] if paired else \
+        ["id", "difficulty", "time", "score", "result"]
+    if agent_cls.measure_memory:
+        header.append("memory_used (MB)")
+    if effort:
+        header.extend(SearchEffort.COLUMNS)
+    return header
+
+
+def check_corpus(boards, agent_cls, games, difficulties):
+    for difficulty in difficulties:
+        if difficulty not in boards.sections:
+            raise ValueError(f"corpus {boards.path} has no {difficulty} boards")
+        grid_size = agent_cls.grid_sizes[difficulty]
+        if boards.grid_size(difficulty) != grid_size:
+            raise ValueError(f"corpus {difficulty} boards are {boards.grid_size(difficulty)} wide, "
+                             f"{agent_cls.__name__} plays {grid_size}")
+        if boards.count(difficulty) < games:
+            raise ValueError(f"corpus has {boards.count(difficulty)} {difficulty} boards, {games} games requested")
+
+
+def board_source(agent_cls, difficulty, count, offset, board_seed, corpus=None):
+    if corpus is None:
+        grid_size = agent_cls.grid_sizes[difficulty]
+        return GridBatcher(grid_size, mine_count(grid_size, difficulty), min(count, 4096), board_seed).next_grid
+    return iter(BoardCorpus(corpus).grids(difficulty, offset, count)).__next__
+
+
+def play_chunk(agent_cls, difficulty, first_id, count, seed, offset, strategy=None, memory=None, profile=False,
+               effort=False, corpus=None, first_click_safe=False):
+    rng = random.Random(seed)
+    meter = memory or MemoryMeter('off')
+    timer = PhaseTimer() if profile else None
+    board_seed = rng.getrandbits(64)
+    if first_click_safe:
+        # Mines depend on the first click, so the game places them itself.
+        next_grid = repeat(None).__next__
+    else:
+        next_grid = board_source(agent_cls, difficulty, count, offset, board_seed, corpus)
+    # On a corpus, random clicks follow a per-game permutation as in
+    # play_paired_chunk, so any strategy run with the same seed replays the
+    # same clicks as well as the same boards.
+    clicks = None
+    if corpus is not None and agent_cls.random_clicks:
+        clicks = np.random.default_rng(rng.getrandbits(64))
+        cells = agent_cls.grid_sizes[difficulty] ** 2
+    # One agent per chunk, reset in place before every game.
+    agent = agent_cls(difficulty, None, strategy, rng, first_click_safe)
+    rows = []
+    for agent_id in range(first_id, first_id + count):
+        order = None if clicks is None else clicks.permutation(cells).tolist()
+        sampled = agent_cls.measure_memory and meter.samples(agent_id)
+        # Tracing slows the game down, so a sampled game's time is left empty
+        # and its phases unbooked.
+        game_timer = None if sampled else timer
+        if sampled:
+            meter.begin()
+        if game_timer is None:
+            agent.new_game(next_grid())
+        else:
+            started = perf_counter_ns()
+            grid = next_grid()
+            generated = perf_counter_ns()
+            agent.new_game(grid)
+            # With first_click_safe the board is generated on the first move
+            # and play_game books it.
+            if not first_click_safe:
+                timer.add(agent.label, difficulty, 'generate', generated - started)
+            timer.add(agent.label, difficulty, 'setup', perf_counter_ns() - generated)
+        if effort:
+            agent.game.effort = SearchEffort()
+        if order is None:
+            time_taken, score = agent.play_game(game_timer)
+        else:
+            time_taken, score = agent.play_order(order, game_timer)
+        memory_used = meter.end() if sampled else None
+        result = 1 if agent.game.is_game_won else 0
+        row = [agent_id, difficulty, None if sampled else round(time_taken, 6), score, result]
+        if agent_cls.measure_memory:
+            row.append(None if memory_used is None else round(memory_used, 6))
+        if effort:
+            row.extend(agent.game.effort.row())
+        rows.append(row)
+    return rows, timer
+
+
+def play_paired_chunk(agent_cls, difficulty, first_id, count, seed, offset, strategies, memory=None, effort=False,
+                      corpus=None):
+    # Common random numbers: every strategy plays the same board with the
+    # same click permutation, giving one row per strategy for each game id.
+    rng = random.Random(seed)
+    meter = memory or MemoryMeter('off')
+    next_grid = board_source(agent_cls, difficulty, count, offset, rng.getrandbits(64), corpus)
+    clicks = np.random.default_rng(rng.getrandbits(64))
+    grid_size = agent_cls.grid_sizes[difficulty]
+    agents = [agent_cls(difficulty, None, strategy, rng) for strategy in strategies]
+    rows = []
+    for agent_id in range(first_id, first_id + count):
+        grid = next_grid()
+        order = clicks.permutation(grid_size * grid_size).tolist()
+        sampled = agent_cls.measure_memory and meter.samples(agent_id)
+        game_rows = [None] * len(agents)
+        # Rotate which strategy goes first so none is always timed cold.
+        for turn in range(len(agents)):
+            index = (agent_id + turn) % len(agents)
+            agent = agents[index]
+            if sampled:
+                meter.begin()
+            agent.new_game(grid)
+            if effort:
+                agent.game.effort = SearchEffort()
+            time_taken, score = agent.play_order(order)
+            memory_used = meter.end() if sampled else None
+            result = 1 if agent.game.is_game_won else 0
+            row = [agent_id, difficulty, agent.game.strategy, None if sampled else round(time_taken, 6), score,
+                   result]
+            if agent_cls.measure_memory:
+                row.append(None if memory_used is None else round(memory_used, 6))
+            if effort:
+                row.extend(agent.game.effort.row())
+            game_rows[index] = row
+        rows.extend(game_rows)
+    return rows, None
+
+
+def summary_file(path):
+    return os.path.splitext(path)[0] + '.summary.json'
+
+
+def report_stopping(stopping, groups, stopped):
+    lines = []
+    for difficulty in dict.fromkeys(difficulty for difficulty, _ in groups):
+        streams = [stats for (group, _), stats in groups.items() if group == difficulty]
+        games = streams[0].games
+        width = max(high - low for low, high in (wilson_interval(stats.wins, stats.games) for stats in streams))
+        status = "target reached" if difficulty in stopped else "budget exhausted"
+        line = (f"{difficulty}: {status} after {games} games, win-rate CI width {width * 100:.3f}% "
+                f"(target {stopping.win_rate_width * 100:.3f}%)")
+        if stopping.moves_width is not None:
+            moves = max(2 * Z_95 * stats.moves.standard_error() for stats in streams)
+            line += f", moves CI width {moves:.3f} (target {stopping.moves_width:.3f})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def stopping_info(stopping, stopped):
+    if stopping is None:
+        return {}
+    return {'stopping': dict(stopping.describe(), stopped=sorted(stopped))}
+
+
+def start_run(checkpoint, resume, seed):
+    # Returns the master seed and, when resuming, the saved run state.
+    state = checkpoint.load() if checkpoint is not None and resume else None
+    if state is None:
+        return master_seed(seed), None
+    print(f"Resuming from '{checkpoint.path}' after game {state['last_id']}.")
+    return state['config']['seed'] if seed is None else seed, state
+
+
+def save_run(checkpoint, writer, config, last_id, aggregates):
+    checkpoint.save({'config': config, 'last_id': last_id, 'aggregates': aggregates,
+                     'output': None if writer is None else writer.flush()})
+
+
+def run_config(agent_cls, games, path, seed, difficulties, memory, effort, corpus, stopping, **options):
+    # Everything that has to match for a checkpoint to be resumed.
+    return dict(options, agent=agent_cls.__name__, games=games, path=path, seed=seed, difficulties=list(difficulties),
+                memory=(memory.mode, memory.sample_every), effort=effort, corpus=corpus,
+                stopping=None if stopping is None else stopping.describe())
+
+
+def simulate_games(agent_cls, games, path, strategy=None, workers=None, seed=None, difficulties=DIFFICULTIES,
+                   memory=None, profile=False, profile_path=None, effort=False, corpus=None, first_click_safe=False,
+                   summary_path=None, stopping=None, checkpoint=None, resume=False):
+    # path=None skips the per-game rows; the summary is always written. With
+    # a StoppingRule, games is the per-difficulty budget and a difficulty
+    # stops at the first chunk boundary where the rule is met; agent ids keep
+    # their planned values, so an id names the same game either way.
+    # A Checkpoint saves the run state every so many games; resume=True
+    # restarts from it and truncates the output back to the saved position.
+    if corpus is not None and first_click_safe:
+        raise ValueError("a corpus fixes the mines in advance, so it cannot be combined with first_click_safe")
+    if corpus is not None:
+        check_corpus(BoardCorpus(corpus), agent_cls, games, difficulties)
+    strategy_name = strategy or agent_cls.strategy
+    label = agent_label(agent_cls, strategy_name)
+    memory = memory or MemoryMeter()
+    seed, state = start_run(checkpoint, resume, seed)
+    config = run_config(agent_cls, games, path, seed, difficulties, memory, effort, corpus, stopping,
+                        strategy=strategy_name, first_click_safe=first_click_safe, profile=profile)
+    if state is None:
+        last_id = 0
+        aggregates = {
+            'groups': {(difficulty, label): GameStats() for difficulty in difficulties},
+            'effort': SearchEffort(),
+            'stopped': set(),
+            'timer': PhaseTimer() if profile else None,
+        }
+    else:
+        checkpoint.check(state, config)
+        last_id = state['last_id']
+        aggregates = state['aggregates']
+    groups = aggregates['groups']
+    effort_totals = aggregates['effort']
+    stopped = aggregates['stopped']
+    timer = aggregates['timer']
+
+    chunks = [chunk for chunk in plan_chunks(difficulties, games, seed) if chunk[1] > last_id]
+    play = partial(play_chunk, agent_cls, strategy=strategy, memory=memory, profile=profile,
+                   effort=effort, corpus=corpus, first_click_safe=first_click_safe)
+    measure_memory = agent_cls.measure_memory
+    effort_start = len(result_header(agent_cls))
+    header = result_header(agent_cls, effort)
+    position = None if state is None else state['output']
+    with open_results(path, header, position=position) if path else nullcontext() as writer:
+        for rows, phases in run_chunks(play, chunks, workers, lambda chunk: chunk[0] in stopped):
+            if timer is not None:
+                timer.merge(phases)
+            for row in rows:
+                groups[row[1], label].add(row[2], row[3], row[4], row[5] if measure_memory else None)
+                if effort:
+                    effort_totals.merge_row(row[effort_start:])
+            if writer is not None:
+                writer.writerows(rows)
+            if stopping is not None and stopping.reached(groups[rows[0][1], label]):
+                stopped.add(rows[0][1])
+            if checkpoint is not None and checkpoint.due(len(rows)):
+                save_run(checkpoint, writer, config, rows[-1][0], aggregates)
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    print(report(groups))
+    if stopping is not None:
+        print(report_stopping(stopping, groups, stopped))
+    if measure_memory:
+        played = max(sum(stats.games for stats in groups.values()), 1)
+        memory_used = RunningStats()
+        for stats in groups.values():
+            memory_used.merge(stats.memory)
+        print(f"Success Rate: {sum(stats.wins for stats in groups.values()) / played * 100:.2f}%")
+        print(f"Average Memory Used: {memory_used.mean:.4f} MB ({memory_used.count} sampled games)")
+    write_summary(summary_path or summary_file(path or f'{strategy_name}_game_results'), groups, seed=seed,
+                  games=games, agent=agent_cls.__name__, **stopping_info(stopping, stopped))
+
+    if effort:
+        calls = max(effort_totals.calls, 1)
+        print(f"Search effort ({strategy_name}): {effort_totals.expansions / calls:.2f} expansions, "
+              f"{effort_totals.pushes / calls:.2f} pushes, {effort_totals.duplicates / calls:.2f} duplicate pushes, "
+              f"{effort_totals.revealed / calls:.2f} cells revealed per reveal call; "
+              f"peak frontier {effort_totals.peak_frontier}")
+
+    if timer is not None:
+        print(timer.report())
+        if profile_path:
+            timer.write_collapsed(profile_path)
+
+
+def simulate_strategies(agent_cls, games, path, strategies=None, workers=None, seed=None, difficulties=DIFFICULTIES,
+                        memory=None, effort=False, corpus=None, summary_path=None, stopping=None, checkpoint=None,
+                        resume=False):
+    strategies = list(strategies or REVEAL_STRATEGIES)
+    if not agent_cls.random_clicks:
+        raise ValueError(f"{agent_cls.__name__} chooses its own clicks, so it cannot replay paired click orders")
+    if corpus is not None:
+        check_corpus(BoardCorpus(corpus), agent_cls, games, difficulties)
+    baseline = strategies[0]
+    memory = memory or MemoryMeter()
+    seed, state = start_run(checkpoint, resume, seed)
+    config = run_config(agent_cls, games, path, seed, difficulties, memory, effort, corpus, stopping,
+                        strategies=strategies)
+    if state is None:
+        last_id = 0
+        # Per strategy: time minus the baseline's time on the same game, and
+        # the number of games whose moves or result differ from the baseline's.
+        aggregates = {
+            'groups': {(difficulty, strategy): GameStats() for difficulty in difficulties for strategy in strategies},
+            'differences': {strategy: RunningStats() for strategy in strategies},
+            'disagreements': dict.fromkeys(strategies, 0),
+            'stopped': set(),
+        }
+    else:
+        checkpoint.check(state, config)
+        last_id = state['last_id']
+        aggregates = state['aggregates']
+    groups = aggregates['groups']
+    differences = aggregates['differences']
+    disagreements = aggregates['disagreements']
+    stopped = aggregates['stopped']
+
+    chunks = [chunk for chunk in plan_chunks(difficulties, games, seed) if chunk[1] > last_id]
+    play = partial(play_paired_chunk, agent_cls, strategies=strategies, memory=memory, effort=effort, corpus=corpus)
+    measure_memory = agent_cls.measure_memory
+    header = result_header(agent_cls, effort, paired=True)
+    position = None if state is None else state['output']
+    with open_results(path, header, position=position) if path else nullcontext() as writer:
+        for rows, _ in run_chunks(play, chunks, workers, lambda chunk: chunk[0] in stopped):
+            for first in range(0, len(rows), len(strategies)):
+                game_rows = rows[first:first + len(strategies)]
+                base_time = game_rows[0][3]
+                base_outcome = game_rows[0][4:6]
+                for row in game_rows:
+                    groups[row[1], row[2]].add(row[3], row[4], row[5], row[6] if measure_memory else None)
+                    if base_time is not None:
+                        differences[row[2]].add(row[3] - base_time)
+                    disagreements[row[2]] += row[4:6] != base_outcome
+            if writer is not None:
+                writer.writerows(rows)
+            difficulty = rows[0][1]
+            if stopping is not None and all(stopping.reached(groups[difficulty, strategy]) for strategy in strategies):
+                stopped.add(difficulty)
+            if checkpoint is not None and checkpoint.due(len(rows) // len(strategies)):
+                save_run(checkpoint, writer, config, rows[-1][0], aggregates)
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    print(report(groups))
+    if stopping is not None:
+        print(report_stopping(stopping, groups, stopped))
+    for strategy in strategies:
+        difference = differences[strategy]
+        print(f"{strategy:<14} vs {baseline}: {difference.mean * 1e6:+.2f} +/- {difference.standard_error() * 1e6:.2f} us "
+              f"per game (moves or result differ in {disagreements[strategy]} games)")
+    write_summary(summary_path or summary_file(path or 'paired_game_results'), groups, seed=seed, games=games,
+                  agent=agent_cls.__name__, **stopping_info(stopping, stopped))
@@ -0,0 +1,31 @@
+import numpy as np
+from sim1_aostar import AndOrAgent, MINE, UNKNOWN
+
+
+def test_and_value_counts_marked_mines_in_hypothetical_numbers():
+    # Center C is unknown with a neighbor M already marked MINE and a single
+    # unknown neighbor U. Clicking C reveals a number that counts M too, so on
+    # the branch where U is a mine the follow-up click on U must be fatal.
+    agent = AndOrAgent('easy', grid=np.zeros((8, 8), dtype=np.int8))
+    size = agent.game.grid_size
+    cell = lambda row, col: row * size + col
+    view = [UNKNOWN] * (size * size)
+    center, mine, unknown = cell(3, 3), cell(2, 2), cell(2, 3)
+    view[mine] = MINE
+    view[cell(3, 2)] = 2
+    view[cell(3, 4)] = 1
+    view[cell(2, 4)] = 1
+    for col in (2, 3, 4):
+        view[cell(4, col)] = 0
+    agent.load_view(view)
+    prior = 0.15
+
+    assert agent.mine_probability(center, center, 3, prior) == 0.0
+    p = agent.mine_probability(unknown, center, 3, prior)
+    assert p == 0.2
+
+    # U safe: C shows 1 and U is safe; U a mine: C shows 2 and U is fatal,
+    # leaving only a fresh cell.
+    expected = (1 - p) * 1.0 + p * (1 - prior)
+    assert abs(agent.and_value(center, 2, prior) - expected) < 1e-9
+    assert agent.view == view
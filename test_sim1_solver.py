@@ -0,0 +1,11 @@
+from simulation import play_chunk
+from sim1_solver import SolverAgent
+
+
+def test_profile_books_every_phase_under_the_agent_label():
+    rows, timer = play_chunk(SolverAgent, 'easy', 0, 20, 5, 0, profile=True, first_click_safe=True)
+    phases = {key[2] for key in timer.totals}
+    assert {key[:2] for key in timer.totals} == {('SolverAgent (bfs)', 'easy')}
+    assert phases == {'generate', 'setup', 'sample', 'reveal', 'check_win'}
+    assert timer.totals['SolverAgent (bfs)', 'easy', 'generate'][1] == 20
+    assert timer.totals['SolverAgent (bfs)', 'easy', 'sample'][1] == sum(row[3] for row in rows)
@@ -0,0 +1,76 @@
+import csv
+from functools import partial
+import pytest
+import runner
+import simulation
+from aggregates import GameStats
+from checkpoint import Checkpoint
+from corpus import build_corpus
+from memory import MemoryMeter
+from results_io import read_columns
+from sim1_bfs import BFSAgent
+from sim1_dfs import DFSAgent
+
+
+def outcomes(path):
+    # The columns that do not depend on timing: id, difficulty, score, result.
+    if path.endswith('.cols'):
+        columns, labels = read_columns(path)
+        return [(int(agent_id), labels['difficulty'][difficulty], int(score), int(result))
+                for agent_id, difficulty, score, result
+                in zip(columns['id'], columns['difficulty'], columns['score'], columns['result'])]
+    with open(path, newline='') as file:
+        return [(int(row['id']), row['difficulty'], int(row['score']), int(row['result']))
+                for row in csv.DictReader(file)]
+
+
+def interrupt_after(chunks, run_chunks):
+    def interrupted(*args, **kwargs):
+        for played, result in enumerate(run_chunks(*args, **kwargs)):
+            if played == chunks:
+                raise KeyboardInterrupt
+            yield result
+    return interrupted
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.cols'])
+def test_resume_after_exception(tmp_path, monkeypatch, suffix):
+    monkeypatch.setattr(simulation, 'plan_chunks', partial(runner.plan_chunks, chunk_size=100))
+    run = partial(simulation.simulate_games, BFSAgent, 500, strategy='bfs', workers=1, seed=7,
+                  difficulties=['easy', 'hard'], memory=MemoryMeter('off'))
+    expected = str(tmp_path / f'expected{suffix}')
+    run(expected, summary_path=str(tmp_path / 'expected.json'))
+
+    path = str(tmp_path / f'results{suffix}')
+    checkpoint = Checkpoint(str(tmp_path / 'run.checkpoint'), every=100)
+    with monkeypatch.context() as patch:
+        patch.setattr(simulation, 'run_chunks', interrupt_after(7, simulation.run_chunks))
+        with pytest.raises(KeyboardInterrupt):
+            run(path, summary_path=str(tmp_path / 'results.json'), checkpoint=checkpoint)
+    run(path, summary_path=str(tmp_path / 'results.json'), checkpoint=checkpoint, resume=True)
+
+    assert outcomes(path) == outcomes(expected)
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_corpus_runs_replay_the_same_clicks(tmp_path):
+    corpus = str(tmp_path / 'boards.bin')
+    build_corpus(corpus, 200, BFSAgent.grid_sizes, seed=3)
+    paths = []
+    for agent_cls, strategy in [(BFSAgent, 'bfs'), (BFSAgent, 'regions'), (DFSAgent, 'dfs')]:
+        path = str(tmp_path / f'{strategy}.csv')
+        simulation.simulate_games(agent_cls, 200, path, strategy=strategy, workers=1, seed=5, corpus=corpus,
+                                  memory=MemoryMeter('off'))
+        paths.append(path)
+    assert outcomes(paths[0]) == outcomes(paths[1]) == outcomes(paths[2])
+
+
+def test_memory_sampled_games_leave_time_empty():
+    rows, _ = simulation.play_chunk(BFSAgent, 'easy', 1, 20, 3, 0, memory=MemoryMeter('tracemalloc', 5))
+    sampled = [row for row in rows if row[0] % 5 == 0]
+    assert all(row[2] is None and row[5] is not None for row in sampled)
+    assert all(row[2] is not None and row[5] is None for row in rows if row not in sampled)
+    stats = GameStats()
+    for row in rows:
+        stats.add(*row[2:])
+    assert stats.games == 20 and stats.time.count == 16